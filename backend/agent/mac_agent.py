@@ -190,7 +190,8 @@ class MacAgent:
             >>> for tool in tools:
             >>>     print(f"{tool['function']['name']}: {tool['function']['description']}")
         """
-        return self.registry.openai_tools()
+        # Copy: the registry's schema list is shared across calls
+        return list(self.registry.openai_tools())
     
     def get_tools_count(self) -> int:
         """
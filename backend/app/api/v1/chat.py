@@ -3,7 +3,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from typing import AsyncIterator
-import json
 import structlog
 
 from app.api.schemas.chat import ChatRequest, ChatResponse
@@ -11,6 +10,8 @@ from app.services.chat_service import ChatService
 from app.services.user_service import UserService
 from app.dependencies import get_chat_service, get_user_service
 from app.core.tools.validators import set_runtime_allowed_roots, reset_runtime_allowed_roots
+from app.utils.sse import SSE_PING, coalesce_frames, sse_event
+from app.config import get_settings
 
 # Import Mac Agent Service
 from agent.api_service import get_mac_agent_service
@@ -43,12 +44,12 @@ async def chat_endpoint(
     - Memory integration
     """
     
-    async def event_generator() -> AsyncIterator[str]:
+    async def event_generator() -> AsyncIterator[bytes]:
         """Generate SSE events"""
         token = None
         try:
             # Send initial ping to establish connection
-            yield ": ping\n\n"
+            yield SSE_PING
             logger.info(
                 "chat_sse_ping_sent",
                 user_id=request.user_id,
@@ -91,7 +92,7 @@ async def chat_endpoint(
                 
                 if event_type == "content":
                     content = event.get("content", "")
-                    yield f"event: content\ndata: {json.dumps(content)}\n\n"
+                    yield sse_event("content", content)
                 
                 elif event_type == "tool_start":
                     data = {
@@ -99,21 +100,21 @@ async def chat_endpoint(
                         "args": event.get("args"),
                         "tool_call_id": event.get("tool_call_id")
                     }
-                    yield f"event: tool_start\ndata: {json.dumps(data)}\n\n"
+                    yield sse_event("tool_start", data)
                 
                 elif event_type == "tool_result":
                     data = {
                         "result": event.get("result"),
                         "tool_call_id": event.get("tool_call_id")
                     }
-                    yield f"event: tool_result\ndata: {json.dumps(data, default=str)}\n\n"
+                    yield sse_event("tool_result", data, default=str)
                 
                 elif event_type == "tts_segment_start":
                     data = {
                         "segment_id": event.get("segment_id"),
                         "text": event.get("text")
                     }
-                    yield f"event: tts_segment_start\ndata: {json.dumps(data)}\n\n"
+                    yield sse_event("tts_segment_start", data)
                 
                 elif event_type == "tts_audio":
                     data = {
@@ -121,24 +122,24 @@ async def chat_endpoint(
                         "audio_chunk": event.get("audio_chunk"),
                         "is_final": event.get("is_final")
                     }
-                    yield f"event: tts_audio\ndata: {json.dumps(data)}\n\n"
+                    yield sse_event("tts_audio", data)
                 
                 elif event_type == "tts_segment_end":
                     data = {
                         "segment_id": event.get("segment_id")
                     }
-                    yield f"event: tts_segment_end\ndata: {json.dumps(data)}\n\n"
+                    yield sse_event("tts_segment_end", data)
                 
                 elif event_type == "tts_error":
                     data = {
                         "segment_id": event.get("segment_id"),
                         "error": event.get("error")
                     }
-                    yield f"event: tts_error\ndata: {json.dumps(data)}\n\n"
+                    yield sse_event("tts_error", data)
                 
                 elif event_type == "error":
                     error_msg = event.get("error", "Unknown error")
-                    yield f"event: error\ndata: {json.dumps(error_msg)}\n\n"
+                    yield sse_event("error", error_msg)
         
         except Exception as e:
             logger.error(
@@ -149,7 +150,7 @@ async def chat_endpoint(
                 error_type=type(e).__name__,
                 exc_info=True
             )
-            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+            yield sse_event("error", str(e))
         
         finally:
             # Reset runtime allowed roots
@@ -160,9 +161,17 @@ async def chat_endpoint(
                     # Context var reset failed (can happen in tests)
                     pass
     
+    # Merge tiny token frames into fewer socket writes
+    settings = get_settings()
+    frames = coalesce_frames(
+        event_generator(),
+        max_bytes=settings.SSE_COALESCE_MAX_BYTES,
+        max_delay_s=settings.SSE_COALESCE_MAX_MS / 1000
+    )
+
     return add_sse_headers(
         StreamingResponse(
-            event_generator(),
+            frames,
             media_type="text/event-stream"
         )
     )
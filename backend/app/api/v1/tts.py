@@ -6,7 +6,6 @@ import os
 import base64
 import asyncio
 from typing import AsyncGenerator
-from queue import Queue
 from threading import Thread
 
 from fastapi import APIRouter, HTTPException
@@ -49,14 +48,24 @@ class TTSRequest(BaseModel):
 
 
 class StreamingCallback(ResultCallback):
-    """流式音频回调处理器"""
+    """
+    流式音频回调处理器
+
+    回调运行在 SDK 的线程中，通过 call_soon_threadsafe 把数据投递到事件循环的
+    asyncio.Queue，消费端直接 await，无需为每个音频块占用一个线程池线程。
+    """
 
-    def __init__(self):
+    def __init__(self, loop: asyncio.AbstractEventLoop):
         super().__init__()
-        self.audio_queue = Queue()
+        self._loop = loop
+        self.audio_queue: asyncio.Queue = asyncio.Queue()
         self.is_completed = False
         self.error_message = None
 
+    def put(self, item) -> None:
+        """线程安全地投递音频块（None 为结束标记）"""
+        self._loop.call_soon_threadsafe(self.audio_queue.put_nowait, item)
+
     def on_open(self):
         """连接建立"""
         pass
@@ -64,12 +73,12 @@ class StreamingCallback(ResultCallback):
     def on_complete(self):
         """合成完成"""
         self.is_completed = True
-        self.audio_queue.put(None)  # 结束标记
+        self.put(None)  # 结束标记
 
     def on_error(self, message: str):
         """错误处理"""
         self.error_message = message
-        self.audio_queue.put(None)
+        self.put(None)
 
     def on_close(self):
         """连接关闭"""
@@ -81,7 +90,7 @@ class StreamingCallback(ResultCallback):
 
     def on_data(self, data: bytes) -> None:
         """接收音频数据"""
-        self.audio_queue.put(data)
+        self.put(data)
 
 
 async def synthesize_speech_stream(
@@ -103,7 +112,7 @@ async def synthesize_speech_stream(
     # 初始化 DashScope API Key
     init_dashscope()
     
-    callback = StreamingCallback()
+    callback = StreamingCallback(asyncio.get_running_loop())
 
     # 创建合成器
     synthesizer = SpeechSynthesizer(
@@ -120,17 +129,14 @@ async def synthesize_speech_stream(
             synthesizer.streaming_complete()
         except Exception as e:
             callback.error_message = str(e)
-            callback.audio_queue.put(None)
+            callback.put(None)
 
     thread = Thread(target=synthesize, daemon=True)
     thread.start()
 
-    # 异步生成音频数据
+    # 异步生成音频数据：收到数据即输出，不额外 sleep 或切换线程
     while True:
-        # 使用 asyncio 避免阻塞
-        audio_chunk = await asyncio.get_event_loop().run_in_executor(
-            None, callback.audio_queue.get
-        )
+        audio_chunk = await callback.audio_queue.get()
 
         if audio_chunk is None:
             # 检查是否有错误
@@ -143,7 +149,8 @@ async def synthesize_speech_stream(
 
         yield audio_chunk
 
-    thread.join(timeout=1)
+    # 结束标记之后线程即将退出；在线程池中等待，避免阻塞事件循环
+    await asyncio.to_thread(thread.join, 1)
 
 
 @router.post("/synthesize")
@@ -154,7 +161,8 @@ async def synthesize_speech(request: TTSRequest):
     接收文本，返回完整的音频数据（base64 编码）
     """
     try:
-        audio_data = b""
+        # 在内存中累积音频（bytearray 原地追加，避免 bytes 反复拼接的二次方复制）
+        audio_data = bytearray()
         async for chunk in synthesize_speech_stream(
             text=request.text,
             model=request.model,
@@ -1,7 +1,7 @@
 # File: backend/app/config.py
 # Purpose: Unified configuration management with pydantic-settings for multi-environment support
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Literal
 from pathlib import Path
 import json
@@ -44,6 +44,24 @@ class Settings(BaseSettings):
     LLM_REQUEST_TIMEOUT: int = 30
     LLM_CACHE_ENABLED: bool = True
     LLM_CACHE_TTL: int = 3600
+    # 自适应 TTL：对话回复首次写入使用较短的基础 TTL，每次命中将剩余 TTL 翻倍，
+    # 最多延长到上限；冷门条目很快过期，热门条目长期保留。embedding 结果稳定，直接使用上限
+    LLM_CACHE_TTL_BASE: int = 600
+    LLM_CACHE_TTL_MAX: int = 86400
+    # 聊天回复精确缓存：同一用户在相同上下文下发送相同消息时直接重放上次回复（不调用模型）。
+    # 只缓存未调用工具的回复，但涉及时间等实时信息的回答也会被重放，默认关闭；缓存按用户隔离
+    CHAT_RESPONSE_CACHE_ENABLED: bool = False
+    # 相同的非流式请求并发时共享同一次 API 调用
+    LLM_INFLIGHT_DEDUP_ENABLED: bool = True
+    # 语义缓存：非流式请求在上下文完全相同、仅最后一条用户消息措辞不同时复用回复
+    # （需要额外一次 embedding 调用；涉及实时状态的请求可能拿到旧回复，默认关闭）
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    # 文本摘要时送入模型的最大字符数（超出部分截断）
+    SUMMARY_INPUT_MAX_CHARS: int = 6000
+    # SSE 写合并：缓冲小帧直到达到字节数或等待时间上限（毫秒，0 表示不合并）
+    SSE_COALESCE_MAX_BYTES: int = 4096
+    SSE_COALESCE_MAX_MS: int = 5
     
     # DashScope (TTS) Configuration
     DASHSCOPE_API_KEY: str = ""
@@ -91,6 +109,8 @@ class Settings(BaseSettings):
     # Redis Configuration
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_MAX_CONNECTIONS: int = 50
+    # Redis 读写/连接超时（秒），超时视为缓存未命中并回退到数据库
+    REDIS_SOCKET_TIMEOUT: float = 0.5
     
     # Celery Configuration
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
@@ -127,6 +147,13 @@ class Settings(BaseSettings):
     MEMORY_SUMMARY_TRIGGER: int = 24
     MEMORY_KEEP_LAST: int = 8
     EMBEDDING_MODEL: str = "text-embedding-3-small"
+    # embedding 缓存版本：更换模型供应商/预处理方式时递增，使旧向量全部失效
+    EMBEDDING_CACHE_VERSION: int = 1
+    # 缓存向量的存储精度："fp16"（体积减半，相似度误差约 1e-3）或 "fp32"
+    EMBEDDING_CACHE_PRECISION: str = "fp16"
+    # 并发的单条 embedding 请求在窗口内合并为一次批量调用（同时也是列表输入的分块上限）
+    EMBEDDING_MAX_BATCH: int = 64
+    EMBEDDING_FLUSH_MS: int = 10
     
     # Monitoring Configuration
     ENABLE_TRACING: bool = False
@@ -161,9 +188,14 @@ class Settings(BaseSettings):
                 "max_tool_turns": self.OPENAI_MAX_TOOL_TURNS,
             }
     
+    @cached_property
+    def allowed_models_set(self) -> frozenset[str]:
+        """ALLOWED_MODELS as a frozenset for constant-time lookups"""
+        return frozenset(self.ALLOWED_MODELS)
+
     def is_model_allowed(self, model: str) -> bool:
         """Check if a model is in the allowed list"""
-        return model in self.ALLOWED_MODELS
+        return model in self.allowed_models_set
     
     def get_cors_origins(self) -> list[str]:
         """Parse CORS_ORIGINS env into list"""
@@ -15,6 +15,7 @@ class ToolStartEvent(TypedDict):
     tool_call_id: str
     name: str
     args: dict[str, Any]
+    arguments: str  # Raw JSON arguments as sent by the model (source of args)
 
 
 class ToolResultEvent(TypedDict):
@@ -8,6 +8,7 @@ from app.infrastructure.llm.openai_client import OpenAIClient
 from app.core.tools.registry import ToolRegistry
 from app.core.agent.events import AgentEvent, ContentEvent, ToolStartEvent, ToolResultEvent
 from app.config import Settings
+from app.utils.json_utils import json_dumps
 
 logger = structlog.get_logger(__name__)
 
@@ -109,7 +110,7 @@ class AgentOrchestrator:
                     tool_choice=tool_choice
                 )
                 
-                current_content = ""
+                content_parts: list[str] = []
                 current_tool_calls: dict[int, dict[str, str]] = {}
                 
                 # Process stream chunks
@@ -124,7 +125,7 @@ class AgentOrchestrator:
                     # Handle content
                     content = delta.get("content")
                     if content:
-                        current_content += content
+                        content_parts.append(content)
                         yield ContentEvent(type="content", content=content)
                     
                     # Handle tool calls
@@ -147,6 +148,7 @@ class AgentOrchestrator:
                                 current_tool_calls[index]["arguments"] += tc.get("function").get("arguments")
                 
                 # Build assistant message
+                current_content = "".join(content_parts)
                 message = {
                     "role": "assistant",
                     "content": current_content if current_content else None,
@@ -196,7 +198,8 @@ class AgentOrchestrator:
                             type="tool_start",
                             tool_call_id=tool_call_id,
                             name=name,
-                            args=args
+                            args=args,
+                            arguments=arguments_text
                         )
                         
                         # Execute tool
@@ -236,7 +239,7 @@ class AgentOrchestrator:
                     messages.append({
                         "role": "tool",
                         "tool_call_id": tool_call_id,
-                        "content": json.dumps(result, ensure_ascii=False),
+                        "content": json_dumps(result),
                     })
             
             except Exception as e:
@@ -0,0 +1,73 @@
+# File: backend/app/core/buffers.py
+# Purpose: Thread-safe pool of reusable bytearray scratch buffers
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator
+
+
+class BufferPool:
+    """
+    Pool of reusable bytearray buffers.
+
+    Buffers are handed out with ``acquire`` and returned automatically when
+    the ``with`` block exits. Small buffers are never pooled (they are cheap
+    to allocate and would crowd out useful ones), and the pool holds at most
+    ``max_buffers`` idle buffers; anything beyond that is left to the GC.
+    """
+
+    MIN_POOLED_SIZE = 1024
+
+    def __init__(self, max_buffers: int = 64):
+        """
+        Initialize the pool.
+
+        Args:
+            max_buffers: Maximum number of idle buffers kept for reuse
+        """
+        self.max_buffers = max_buffers
+        self._buffers: Deque[bytearray] = deque()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, min_size: int) -> Iterator[bytearray]:
+        """
+        Borrow a buffer of at least ``min_size`` bytes.
+
+        The buffer's contents are undefined; callers must not keep references
+        (including memoryviews) to it after the ``with`` block.
+
+        Args:
+            min_size: Minimum buffer length in bytes
+
+        Yields:
+            A bytearray with len() >= min_size
+        """
+        buf = self._take(min_size)
+        try:
+            yield buf
+        finally:
+            self._release(buf)
+
+    def _take(self, min_size: int) -> bytearray:
+        with self._lock:
+            for _ in range(len(self._buffers)):
+                buf = self._buffers.popleft()
+                if len(buf) >= min_size:
+                    return buf
+                self._buffers.append(buf)
+        return bytearray(min_size)
+
+    def _release(self, buf: bytearray) -> None:
+        if len(buf) < self.MIN_POOLED_SIZE:
+            return
+        with self._lock:
+            if len(self._buffers) < self.max_buffers:
+                self._buffers.append(buf)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+
+# Process-wide pool for I/O scratch buffers (attachment encoding, etc.)
+scratch_buffers = BufferPool()
@@ -0,0 +1,31 @@
+# File: backend/app/core/hashing.py
+# Purpose: Fast non-cryptographic identity hashes for cache and dedup keys
+import hashlib
+from typing import Union
+
+FAST_KEY_SIZE = 16
+
+
+def fast_key(*parts: Union[bytes, str]) -> bytes:
+    """
+    Hash a sequence of parts into a 128-bit identity key.
+
+    Each part is length-prefixed, so ("ab", "c") and ("a", "bc") produce
+    different keys. Uses blake2b, which is faster than the SHA-2 family for
+    short inputs. Not for security-sensitive purposes (content addressing of
+    user files, tokens, etc.); use sha256 there.
+
+    Args:
+        *parts: Key components; str parts are UTF-8 encoded
+
+    Returns:
+        16-byte digest
+    """
+    digest = hashlib.blake2b(digest_size=FAST_KEY_SIZE)
+    update = digest.update
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        update(len(part).to_bytes(8, "little"))
+        update(part)
+    return digest.digest()
@@ -8,19 +8,24 @@ from agent.tools.base import Tool
 class ToolRegistry:
     def __init__(self, tools: list[Tool]) -> None:
         self._tools = {tool.name: tool for tool in tools}
+        self._openai_tools: list[dict[str, Any]] | None = None
 
     def openai_tools(self) -> list[dict[str, Any]]:
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.parameters,
-                },
-            }
-            for tool in self._tools.values()
-        ]
+        # The tool set is fixed after construction, so build the schemas once
+        # and hand out the same list (callers must treat it as read-only).
+        if self._openai_tools is None:
+            self._openai_tools = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "parameters": tool.parameters,
+                    },
+                }
+                for tool in self._tools.values()
+            ]
+        return self._openai_tools
 
     def execute(self, name: str, args: dict[str, Any]) -> dict[str, Any]:
         tool = self._tools.get(name)
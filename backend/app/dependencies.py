@@ -17,7 +17,7 @@ from app.services.llm_service import LLMService
 from app.services.session_service import SessionService
 from app.services.user_service import UserService
 from app.services.file_service import FileService
-from app.services.chat_service import ChatService
+from app.services.chat_service import ChatService, get_tool_registry
 from app.services.conversation_history_service import ConversationHistoryService
 from app.services.markdown_exporter import MarkdownExporter
 
@@ -260,6 +260,21 @@ async def get_chat_service(
     )
 
 
+async def warm_up_singletons(settings: Settings) -> None:
+    """
+    Build process-wide singletons at startup instead of on the first chat turn.
+
+    Creates the shared LLM client and the tool registry, importing the tool
+    modules and building their OpenAI schemas.
+
+    Args:
+        settings: Application settings
+    """
+    await get_llm_client(settings)
+    tool_count = len(get_tool_registry(settings).openai_tools())
+    logger.info("singletons_warmed_up", tool_count=tool_count)
+
+
 # ============================================================================
 # Utility Dependencies
 # ============================================================================
@@ -1,15 +1,27 @@
 # File: backend/app/infrastructure/cache/cache_manager.py
 # Purpose: Cache manager for LLM responses and general caching with Redis
 import json
-import hashlib
 import time
 import fnmatch
-from typing import Any, Optional, Union
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Awaitable, Callable, Optional, Union
 from redis.asyncio import Redis
 import structlog
 
+from app.core.hashing import fast_key
+from app.utils.json_utils import json_dumps
+
 logger = structlog.get_logger(__name__)
 
+# In-memory fallback store shared by every CacheManager in the process.
+# A manager is created per request, so a per-instance store would never hit.
+# Kept in LRU order and bounded, since nothing else ever removes entries.
+_memory_store: OrderedDict[str, tuple[str, Optional[float]]] = OrderedDict()
+MEMORY_STORE_MAX_ENTRIES = 10000
+# Least recently used entries checked for expiry on every write
+_MEMORY_SWEEP_BATCH = 8
+
 
 class CacheManager:
     """
@@ -27,7 +39,7 @@ class CacheManager:
         """
         self.redis = redis_client
         self.default_ttl = default_ttl
-        self._memory_store: dict[str, tuple[str, Optional[float]]] = {}
+        self._memory_store = _memory_store
         self._memory_enabled = redis_client is None
         if self._memory_enabled:
             logger.warning("cache_fallback_in_memory_enabled")
@@ -35,7 +47,7 @@ class CacheManager:
     def _generate_key(self, prefix: str, *args: Any) -> str:
         """
         Generate cache key from prefix and arguments.
-        Uses MD5 hash for consistent key generation.
+        Uses a 128-bit blake2b hash for consistent key generation.
         
         Args:
             prefix: Key prefix (e.g., 'llm', 'session', 'user')
@@ -46,7 +58,7 @@ class CacheManager:
         """
         # Serialize arguments to JSON for consistent hashing
         key_data = json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
-        hash_suffix = hashlib.md5(key_data.encode()).hexdigest()[:12]
+        hash_suffix = fast_key(key_data).hex()
         return f"{prefix}:{hash_suffix}"
 
     def _now(self) -> float:
@@ -60,11 +72,21 @@ class CacheManager:
         if expire_at is not None and expire_at <= self._now():
             self._memory_store.pop(key, None)
             return None
+        self._memory_store.move_to_end(key)
         return value
 
     def _set_memory(self, key: str, value: str, ttl: Optional[int]) -> bool:
-        expire_at = self._now() + ttl if ttl else None
-        self._memory_store[key] = (value, expire_at)
+        now = self._now()
+        store = self._memory_store
+        store[key] = (value, now + ttl if ttl else None)
+        store.move_to_end(key)
+        # Expired entries that are never read again collect at the LRU end
+        for old_key in list(islice(store, _MEMORY_SWEEP_BATCH)):
+            expire_at = store[old_key][1]
+            if expire_at is not None and expire_at <= now:
+                del store[old_key]
+        while len(store) > MEMORY_STORE_MAX_ENTRIES:
+            store.popitem(last=False)
         return True
 
     def _delete_memory(self, key: str) -> bool:
@@ -73,6 +95,14 @@ class CacheManager:
     def _exists_memory(self, key: str) -> bool:
         return self._get_memory(key) is not None
 
+    def _ttl_memory(self, key: str) -> int:
+        if self._get_memory(key) is None:
+            return -2
+        expire_at = self._memory_store[key][1]
+        if expire_at is None:
+            return -1
+        return max(round(expire_at - self._now()), 0)
+
     def _expire_memory(self, key: str, ttl: int) -> bool:
         value = self._get_memory(key)
         if value is None:
@@ -146,6 +176,39 @@ class CacheManager:
             logger.error("cache_set_error", key=key, error=str(e))
             return False
     
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Return the JSON value cached under key, loading and caching it on a miss.
+
+        Cache errors count as misses (see get/set), so the loader is the
+        fallback whenever Redis is slow or unavailable. None results are not cached.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing a JSON-serializable value
+            ttl: Time to live in seconds (uses default if None)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        cached = await self.get(key)
+        if cached:
+            try:
+                return json.loads(cached)
+            except json.JSONDecodeError:
+                logger.error("cache_decode_error", key=key)
+                await self.delete(key)
+
+        value = await loader()
+        if value is not None:
+            await self.set(key, json_dumps(value), ttl=ttl)
+        return value
+
     async def delete(self, key: str) -> bool:
         """
         Delete key from cache.
@@ -207,6 +270,44 @@ class CacheManager:
             logger.error("cache_expire_error", key=key, error=str(e))
             return False
     
+    async def ttl(self, key: str) -> int:
+        """
+        Get the remaining time to live of a key.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Remaining seconds, -1 if the key never expires, -2 if it does not
+            exist or on error (same convention as Redis TTL)
+        """
+        try:
+            if self._memory_enabled:
+                return self._ttl_memory(key)
+            return await self.redis.ttl(key)
+        except Exception as e:
+            logger.error("cache_ttl_error", key=key, error=str(e))
+            return -2
+    
+    async def extend_ttl(self, key: str, max_ttl: int) -> bool:
+        """
+        Double the remaining TTL of a key, capped at max_ttl.
+        
+        Called on cache hits so frequently used entries live longer while
+        entries that are never read again expire after their base TTL.
+        
+        Args:
+            key: Cache key
+            max_ttl: Upper bound for the new TTL in seconds
+        
+        Returns:
+            True if the TTL was extended
+        """
+        remaining = await self.ttl(key)
+        if remaining < 0 or remaining >= max_ttl:
+            return False
+        return await self.expire(key, min(max(remaining, 1) * 2, max_ttl))
+    
     async def increment(self, key: str, amount: int = 1) -> Optional[int]:
         """
         Increment a counter.
@@ -347,6 +448,8 @@ class CacheManager:
         messages: list[dict],
         model: str,
         temperature: float = 0.7,
+        key: Optional[str] = None,
+        max_ttl: Optional[int] = None,
         **kwargs
     ) -> Optional[dict]:
         """
@@ -356,21 +459,26 @@ class CacheManager:
             messages: List of message dictionaries
             model: Model name
             temperature: Temperature parameter
+            key: Precomputed llm_cache_key (skips re-hashing the request)
+            max_ttl: If set, a hit doubles the entry's remaining TTL up to this bound
             **kwargs: Additional parameters
         
         Returns:
             Cached response dictionary or None
         """
-        key = self.llm_cache_key(messages, model, temperature, **kwargs)
+        key = key or self.llm_cache_key(messages, model, temperature, **kwargs)
         cached = await self.get(key)
         
         if cached:
             try:
-                return json.loads(cached)
+                response = json.loads(cached)
             except json.JSONDecodeError:
                 logger.error("llm_cache_decode_error", key=key)
                 await self.delete(key)  # Remove corrupted cache
                 return None
+            if max_ttl:
+                await self.extend_ttl(key, max_ttl)
+            return response
         return None
     
     async def set_llm_response(
@@ -380,6 +488,7 @@ class CacheManager:
         response: dict,
         temperature: float = 0.7,
         ttl: Optional[int] = None,
+        key: Optional[str] = None,
         **kwargs
     ) -> bool:
         """
@@ -391,12 +500,13 @@ class CacheManager:
             response: Response dictionary to cache
             temperature: Temperature parameter
             ttl: Time to live in seconds
+            key: Precomputed llm_cache_key (skips re-hashing the request)
             **kwargs: Additional parameters
         
         Returns:
             True if cached successfully
         """
-        key = self.llm_cache_key(messages, model, temperature, **kwargs)
+        key = key or self.llm_cache_key(messages, model, temperature, **kwargs)
         value = json.dumps(response, ensure_ascii=False)
         return await self.set(key, value, ttl=ttl)
     
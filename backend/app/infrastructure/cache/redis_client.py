@@ -31,6 +31,8 @@ def get_redis_pool(settings: Settings) -> ConnectionPool:
     _redis_pool = ConnectionPool.from_url(
         settings.REDIS_URL,
         max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
         decode_responses=True,  # Automatically decode bytes to strings
         encoding="utf-8",
     )
@@ -0,0 +1,101 @@
+# File: backend/app/infrastructure/cache/response_cache.py
+# Purpose: Process-local exact-match cache for complete assistant replies
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.hashing import fast_key
+
+
+class ResponseCache:
+    """
+    Exact-match LRU cache of assistant replies.
+
+    Keys are 128-bit blake2b digests of everything that determines the
+    reply (model, system prompt, history window and the user turn), so a hit
+    can be replayed without calling the LLM. The user id is part of the key:
+    replies are never shared between users. Entries expire after ``ttl``
+    seconds and the least recently used entry is evicted beyond ``maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = 3600):
+        """
+        Initialize the response cache.
+
+        Args:
+            maxsize: Maximum number of cached replies
+            ttl: Entry lifetime in seconds (None = never expire)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[str, Optional[float]]] = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        user_id: str,
+        model: str,
+        system_prompt: str,
+        history: list[dict],
+        user_input: Any
+    ) -> bytes:
+        """
+        Build the cache key for a chat turn.
+
+        Args:
+            user_id: User the reply was generated for
+            model: Model name
+            system_prompt: Full system prompt
+            history: Prior messages sent with the turn
+            user_input: Current user message content
+
+        Returns:
+            16-byte blake2b digest
+        """
+        return fast_key(
+            user_id,
+            model,
+            system_prompt,
+            json.dumps([history, user_input], ensure_ascii=False, sort_keys=True)
+        )
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached reply, refreshing its LRU position.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached reply or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        content, expire_at = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return content
+
+    def set(self, key: bytes, content: str) -> None:
+        """
+        Store a reply, evicting the least recently used entry if full.
+
+        Args:
+            key: Key from make_key
+            content: Complete assistant reply
+        """
+        expire_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (content, expire_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached replies."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,147 @@
+# File: backend/app/infrastructure/cache/semantic_cache.py
+# Purpose: Process-local similarity cache for LLM responses, keyed by query embedding
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from operator import mul
+from typing import Any, Optional, Sequence
+
+from app.core.hashing import fast_key
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Canonicalize a user query before embedding it.
+
+    Args:
+        text: Raw user message
+
+    Returns:
+        Lowercased text with whitespace runs collapsed
+    """
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+class SemanticCache:
+    """
+    Similarity cache of LLM responses.
+
+    Everything except the last user message must match exactly: entries are
+    grouped by a scope key over the model, tools, prior messages and
+    sampling parameters. Within a scope, a lookup returns the stored
+    response whose query embedding has the highest cosine similarity, if it
+    reaches ``threshold``. Scopes are evicted least recently used beyond
+    ``max_scopes``, each keeps its ``entries_per_scope`` newest entries, and
+    entries expire after ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_scopes: int = 1024,
+        entries_per_scope: int = 32,
+        ttl: Optional[float] = 3600
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_scopes: Maximum number of scopes kept
+            entries_per_scope: Maximum entries per scope (scanned linearly)
+            ttl: Entry lifetime in seconds (None = never expire)
+        """
+        self.threshold = threshold
+        self.max_scopes = max_scopes
+        self.entries_per_scope = entries_per_scope
+        self.ttl = ttl
+        self._scopes: OrderedDict[bytes, list[tuple[tuple[float, ...], dict, Optional[float]]]] = OrderedDict()
+
+    @staticmethod
+    def make_scope(model: str, prefix_messages: list[dict], **params: Any) -> bytes:
+        """
+        Build the scope key for a request.
+
+        Args:
+            model: Model name
+            prefix_messages: All messages before the user query
+            **params: Other request parameters (tools, temperature, ...)
+
+        Returns:
+            16-byte blake2b digest
+        """
+        return fast_key(
+            model,
+            json.dumps([prefix_messages, params], ensure_ascii=False, sort_keys=True, default=str)
+        )
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> Optional[tuple[float, ...]]:
+        norm = math.sqrt(math.fsum(x * x for x in vector))
+        if not norm:
+            return None
+        return tuple(x / norm for x in vector)
+
+    def lookup(self, scope: bytes, embedding: Sequence[float]) -> Optional[tuple[dict, float]]:
+        """
+        Find the most similar cached response in a scope.
+
+        Args:
+            scope: Key from make_scope
+            embedding: Embedding of the normalized user query
+
+        Returns:
+            (response, similarity) for the best match at or above the
+            threshold, or None
+        """
+        entries = self._scopes.get(scope)
+        query = self._normalize(embedding)
+        if not entries or query is None:
+            return None
+
+        now = time.monotonic()
+        entries[:] = [entry for entry in entries if entry[2] is None or entry[2] > now]
+        best: Optional[tuple[dict, float]] = None
+        for vector, response, _ in entries:
+            if len(vector) != len(query):
+                continue
+            similarity = sum(map(mul, vector, query))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (response, similarity)
+
+        if not entries:
+            del self._scopes[scope]
+        elif best is not None:
+            self._scopes.move_to_end(scope)
+        return best
+
+    def store(self, scope: bytes, embedding: Sequence[float], response: dict) -> None:
+        """
+        Cache a response under a query embedding.
+
+        Args:
+            scope: Key from make_scope
+            embedding: Embedding of the normalized user query
+            response: Response to replay on similar queries
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        expire_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        entries = self._scopes.setdefault(scope, [])
+        entries.append((vector, response, expire_at))
+        del entries[:-self.entries_per_scope]
+        self._scopes.move_to_end(scope)
+        while len(self._scopes) > self.max_scopes:
+            self._scopes.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._scopes.clear()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._scopes.values())
@@ -7,6 +7,7 @@ from typing import AsyncGenerator
 import structlog
 
 from app.config import Settings
+from app.utils.json_utils import json_dumps
 
 logger = structlog.get_logger(__name__)
 
@@ -63,6 +64,7 @@ def get_engine(settings: Settings):
             echo=settings.DB_ECHO,
             poolclass=pool_class,
             connect_args=connect_args,
+            json_serializer=json_dumps,
             **pool_kwargs
         )
     else:
@@ -71,6 +73,7 @@ def get_engine(settings: Settings):
             database_url,
             echo=settings.DB_ECHO,
             connect_args=connect_args,
+            json_serializer=json_dumps,
             **pool_kwargs
         )
 
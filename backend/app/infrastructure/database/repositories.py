@@ -1,7 +1,7 @@
 # File: backend/app/infrastructure/database/repositories.py
 # Purpose: Repository pattern implementation for data access layer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, func
+from sqlalchemy import select, delete, update, func, case, Row
 from sqlalchemy.orm import selectinload
 from typing import Optional, List
 from datetime import datetime
@@ -16,6 +16,13 @@ from app.infrastructure.database.models import (
 
 logger = structlog.get_logger(__name__)
 
+# Columns read by MessageRepository.list_rows_by_session
+_MESSAGE_COLUMNS = (
+    Message.id, Message.session_id, Message.role, Message.content,
+    Message.tool_calls, Message.tool_call_results, Message.message_metadata,
+    Message.created_at,
+)
+
 
 def _is_sqlite_locked_error(err: OperationalError) -> bool:
     # SQLAlchemy 会包装底层 sqlite3.OperationalError
@@ -165,6 +172,54 @@ class SessionRepository:
         )
         return result.scalar_one()
 
+    async def get_stats(self, session_id: str) -> Optional[dict]:
+        """
+        Aggregate per-role message counts, tool call totals and the time span
+        of a session in the database, without loading any message rows.
+
+        Returns:
+            Dict with "role_counts", "total_tool_calls", "first_message_at"
+            and "last_message_at", or None if the dialect has no JSON array
+            length function (callers should fall back to counting in Python)
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            # json_array_length raises on non-array values (e.g. a JSON null)
+            tool_calls = case(
+                (func.json_typeof(Message.tool_calls) == "array", Message.tool_calls)
+            )
+        elif dialect == "sqlite":
+            tool_calls = Message.tool_calls
+        else:
+            return None
+
+        result = await self.db.execute(
+            select(
+                Message.role,
+                func.count(Message.id),
+                func.coalesce(func.sum(func.json_array_length(tool_calls)), 0),
+                func.min(Message.created_at),
+                func.max(Message.created_at),
+            )
+            .where(Message.session_id == session_id)
+            .group_by(Message.role)
+        )
+
+        stats = {
+            "role_counts": {},
+            "total_tool_calls": 0,
+            "first_message_at": None,
+            "last_message_at": None,
+        }
+        for role, count, tool_call_count, first_at, last_at in result.all():
+            stats["role_counts"][role] = count
+            stats["total_tool_calls"] += int(tool_call_count)
+            if first_at is not None and (stats["first_message_at"] is None or first_at < stats["first_message_at"]):
+                stats["first_message_at"] = first_at
+            if last_at is not None and (stats["last_message_at"] is None or last_at > stats["last_message_at"]):
+                stats["last_message_at"] = last_at
+        return stats
+
 
 class MessageRepository:
     """Repository for Message model operations"""
@@ -198,6 +253,35 @@ class MessageRepository:
             return message
 
         return await _run_with_sqlite_write_retry("message_create", _op)  # type: ignore[return-value]
+
+    async def create_many(
+        self,
+        session_id: str,
+        messages: List[dict]
+    ) -> List[Message]:
+        """Create several messages in a single flush (insertion order is preserved)"""
+        rows = []
+        for msg in messages:
+            row = Message(
+                id=msg["message_id"],
+                session_id=session_id,
+                role=msg["role"],
+                content=msg["content"],
+                tool_calls=msg.get("tool_calls") or [],
+                tool_call_results=msg.get("tool_call_results"),
+                message_metadata=msg.get("metadata")
+            )
+            if msg.get("created_at") is not None:
+                row.created_at = msg["created_at"]
+            rows.append(row)
+
+        async def _op():
+            self.db.add_all(rows)
+            await self.db.flush()
+            return rows
+
+        return await _run_with_sqlite_write_retry("message_create_many", _op)  # type: ignore[return-value]
+
     
     async def list_by_session(
         self,
@@ -219,6 +303,58 @@ class MessageRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all())
     
+    async def list_rows_by_session(
+        self,
+        session_id: str,
+        include_system: bool = True,
+        since: Optional[datetime] = None
+    ) -> List[Row]:
+        """
+        List a session's messages as plain column rows, oldest first.
+
+        Cheaper than loading ORM objects when the caller only reads the
+        values (no identity map or attribute instrumentation per row).
+
+        Args:
+            session_id: Session ID
+            include_system: Whether to include system messages
+            since: Only messages created at or after this time
+
+        Returns:
+            Rows with the same attribute names as Message
+        """
+        query = (
+            select(*_MESSAGE_COLUMNS)
+            .where(Message.session_id == session_id)
+            .order_by(Message.created_at.asc())
+        )
+        if not include_system:
+            query = query.where(Message.role != "system")
+        if since is not None:
+            query = query.where(Message.created_at >= since)
+
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def count_by_session(self, session_id: str, include_system: bool = True) -> int:
+        """Count a session's messages"""
+        query = select(func.count(Message.id)).where(Message.session_id == session_id)
+        if not include_system:
+            query = query.where(Message.role != "system")
+        result = await self.db.execute(query)
+        return result.scalar_one()
+
+    async def get_first_system_prompt(self, session_id: str) -> Optional[str]:
+        """Get the content of a session's earliest system message, if any"""
+        result = await self.db.execute(
+            select(Message.content)
+            .where(Message.session_id == session_id)
+            .where(Message.role == "system")
+            .order_by(Message.created_at.asc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def get_recent_messages(
         self,
         session_id: str,
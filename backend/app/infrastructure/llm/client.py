@@ -7,6 +7,12 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:  # h2 is optional
+    HTTP2_AVAILABLE = False
+
 
 class LLMClient:
     """
@@ -35,8 +41,11 @@ class LLMClient:
         self.timeout = timeout
         self.max_retries = max_retries
         
-        # Create HTTP client with connection pooling
+        # Create HTTP client with connection pooling. With HTTP/2 (negotiated
+        # via TLS ALPN, so plain-http endpoints stay on HTTP/1.1) concurrent
+        # chat turns multiplex over one connection instead of one each.
         self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
             timeout=httpx.Timeout(timeout),
             limits=httpx.Limits(
                 max_keepalive_connections=20,
@@ -56,6 +65,7 @@ class LLMClient:
         self,
         method: str,
         endpoint: str,
+        timeout: Optional[float] = None,
         **kwargs
     ) -> httpx.Response:
         """
@@ -64,6 +74,8 @@ class LLMClient:
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint
+            timeout: Per-request timeout in seconds (defaults to the client timeout).
+                Enforced by httpx on the socket, so no extra task or timer is created.
             **kwargs: Additional arguments for httpx request
         
         Returns:
@@ -74,14 +86,18 @@ class LLMClient:
             asyncio.TimeoutError: On timeout
         """
         url = f"{self.base_url}{endpoint}"
+        if timeout is None:
+            timeout = self.timeout
+        else:
+            kwargs["timeout"] = timeout
         
         try:
             response = await self.client.request(method, url, **kwargs)
             response.raise_for_status()
             return response
         except httpx.TimeoutException as e:
-            logger.error("llm_request_timeout", url=url, timeout=self.timeout)
-            raise asyncio.TimeoutError(f"Request timed out after {self.timeout}s") from e
+            logger.error("llm_request_timeout", url=url, timeout=timeout)
+            raise asyncio.TimeoutError(f"Request timed out after {timeout}s") from e
         except httpx.HTTPStatusError as e:
             logger.error(
                 "llm_http_error",
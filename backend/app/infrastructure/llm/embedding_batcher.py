@@ -0,0 +1,103 @@
+# File: backend/app/infrastructure/llm/embedding_batcher.py
+# Purpose: Coalesce concurrent single-text embedding requests into batched API calls
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batcher for embedding requests.
+
+    Texts submitted with ``embed`` are collected for up to ``flush_delay_s``
+    (or until ``max_batch`` distinct texts are waiting) and sent to the
+    provider in a single call. Identical texts share one slot while they are
+    waiting or their batch is in flight, so they are embedded once.
+    """
+
+    def __init__(self, fetch: EmbedFn, max_batch: int = 64, flush_delay_s: float = 0.01):
+        """
+        Initialize the batcher.
+
+        Args:
+            fetch: Embeds a list of texts, returning vectors in the same order
+            max_batch: Flush as soon as this many distinct texts are waiting
+            flush_delay_s: Maximum time the first waiting text is held back
+        """
+        self.fetch = fetch
+        self.max_batch = max_batch
+        self.flush_delay_s = flush_delay_s
+        self._pending: dict[str, asyncio.Future] = {}
+        # Texts whose batch has been sent but not answered yet
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references so in-flight batch tasks are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Embed one text as part of the next batch.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            Exception: Whatever the batched provider call raised
+        """
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(text) or self._inflight.get(text)
+        if future is None:
+            future = loop.create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.flush_delay_s, self._flush)
+        # Shield so one caller going away does not cancel the result for the others
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            self._inflight.update(batch)
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, asyncio.Future]) -> None:
+        try:
+            await self._resolve(batch)
+        finally:
+            for text, future in batch.items():
+                if self._inflight.get(text) is future:
+                    del self._inflight[text]
+
+    async def _resolve(self, batch: dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        try:
+            vectors = await self.fetch(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                    # Mark retrieved: callers that already gave up must not trigger warnings
+                    future.exception()
+            return
+
+        for text, vector in zip(texts, vectors):
+            future = batch[text]
+            if not future.done():
+                future.set_result(vector)
@@ -5,6 +5,7 @@ from typing import Optional, AsyncIterator, Union
 import structlog
 
 from app.infrastructure.llm.client import LLMClient
+from app.utils.json_utils import json_dumps_bytes, json_loads
 
 logger = structlog.get_logger(__name__)
 
@@ -23,6 +24,7 @@ class OpenAIClient(LLMClient):
         stream: bool = False,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
         **kwargs
     ) -> Union[dict, AsyncIterator[dict]]:
         """
@@ -35,6 +37,8 @@ class OpenAIClient(LLMClient):
             stream: Whether to stream the response
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            timeout: Request timeout in seconds for non-streaming calls
+                (streams keep the client timeout, which applies per read)
             **kwargs: Additional parameters
         
         Returns:
@@ -76,7 +80,7 @@ class OpenAIClient(LLMClient):
                 has_tools=tools is not None
             )
             
-            return await self._complete(endpoint, payload)
+            return await self._complete(endpoint, payload, timeout)
     
     def chat_completions_stream(
         self,
@@ -128,9 +132,11 @@ class OpenAIClient(LLMClient):
         # Return the async generator directly
         return self._stream_completion(endpoint, payload)
     
-    async def _complete(self, endpoint: str, payload: dict) -> dict:
+    async def _complete(self, endpoint: str, payload: dict, timeout: Optional[float] = None) -> dict:
         """Non-streaming completion"""
-        response = await self._make_request("POST", endpoint, json=payload)
+        response = await self._make_request(
+            "POST", endpoint, timeout=timeout, content=json_dumps_bytes(payload)
+        )
         result = response.json()
         
         logger.debug(
@@ -155,7 +161,10 @@ class OpenAIClient(LLMClient):
                 base_url=self.base_url
             )
             
-            async with self.client.stream("POST", f"{self.base_url}{endpoint}", json=payload) as response:
+            # Encode the body ourselves: the cached tool schemas are mostly Chinese text,
+            # which httpx's json= would re-escape to \uXXXX with the stdlib encoder on every call
+            body = json_dumps_bytes(payload)
+            async with self.client.stream("POST", f"{self.base_url}{endpoint}", content=body) as response:
                 response.raise_for_status()
                 
                 logger.info(
@@ -177,7 +186,7 @@ class OpenAIClient(LLMClient):
                             break
                         
                         try:
-                            chunk = json.loads(data)
+                            chunk = json_loads(data)
                             chunk_count += 1
                             yield chunk
                         except json.JSONDecodeError as e:
@@ -199,7 +208,8 @@ class OpenAIClient(LLMClient):
     async def create_embedding(
         self,
         input_text: Union[str, list[str]],
-        model: str = "text-embedding-3-small"
+        model: str = "text-embedding-3-small",
+        timeout: Optional[float] = None
     ) -> dict:
         """
         Create embeddings for text.
@@ -207,6 +217,7 @@ class OpenAIClient(LLMClient):
         Args:
             input_text: Text or list of texts to embed
             model: Embedding model name
+            timeout: Request timeout in seconds (defaults to the client timeout)
         
         Returns:
             Embedding response dictionary
@@ -218,5 +229,7 @@ class OpenAIClient(LLMClient):
             "input": input_text
         }
         
-        response = await self._make_request("POST", endpoint, json=payload)
+        response = await self._make_request(
+            "POST", endpoint, timeout=timeout, content=json_dumps_bytes(payload)
+        )
         return response.json()
@@ -1,7 +1,10 @@
 # File: backend/app/infrastructure/llm/retry_policy.py
 # Purpose: Retry policies for LLM API calls with exponential backoff
 import asyncio
-from typing import Callable, TypeVar, Any
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, TypeVar, Any, Optional, Union
 from functools import wraps
 import structlog
 
@@ -21,7 +24,8 @@ class RetryPolicy:
         initial_delay: float = 1.0,
         max_delay: float = 60.0,
         exponential_base: float = 2.0,
-        jitter: bool = True
+        jitter: bool = True,
+        max_total_delay: Union[float, Callable[[], float], None] = None
     ):
         """
         Initialize retry policy.
@@ -30,36 +34,74 @@ class RetryPolicy:
             max_attempts: Maximum number of retry attempts
             initial_delay: Initial delay in seconds
             max_delay: Maximum delay in seconds
-            exponential_base: Base for exponential backoff
-            jitter: Whether to add random jitter to delays
+            exponential_base: Base for exponential backoff (without jitter)
+            jitter: Whether to use decorrelated-jitter delays
+            max_total_delay: Budget in seconds for all waits together, or a
+                callable returning it; retrying stops once a wait would
+                exceed it (None = unlimited)
         """
         self.max_attempts = max_attempts
         self.initial_delay = initial_delay
         self.max_delay = max_delay
         self.exponential_base = exponential_base
         self.jitter = jitter
+        self.max_total_delay = max_total_delay
     
-    def calculate_delay(self, attempt: int) -> float:
+    def calculate_delay(self, attempt: int, prev_delay: Optional[float] = None) -> float:
         """
         Calculate delay for a given attempt number.
         
+        With jitter this is "decorrelated jitter" backoff: each delay is drawn
+        uniformly from [initial_delay, 3 * previous delay], so clients that
+        failed together spread their retries out instead of retrying in lockstep.
+        
         Args:
             attempt: Current attempt number (0-indexed)
+            prev_delay: Previous delay in seconds (None on the first retry)
         
         Returns:
             Delay in seconds
         """
-        delay = min(
+        if self.jitter:
+            upper = (prev_delay or self.initial_delay) * 3
+            return min(self.max_delay, random.uniform(self.initial_delay, upper))
+        
+        return min(
             self.initial_delay * (self.exponential_base ** attempt),
             self.max_delay
         )
+    
+    def total_delay_budget(self) -> Optional[float]:
+        """Get the total wait budget in seconds (None = unlimited)"""
+        if callable(self.max_total_delay):
+            return self.max_total_delay()
+        return self.max_total_delay
+    
+    @staticmethod
+    def retry_after(exception: Exception) -> Optional[float]:
+        """
+        Read the server's Retry-After header from an HTTP error.
         
-        if self.jitter:
-            import random
-            # Add jitter: random value between 0 and delay
-            delay = delay * (0.5 + random.random() * 0.5)
+        Args:
+            exception: Exception that was raised
         
-        return delay
+        Returns:
+            Seconds to wait, or None if the header is absent or invalid
+        """
+        response = getattr(exception, 'response', None)
+        headers = getattr(response, 'headers', None)
+        value = headers.get('retry-after') if headers is not None else None
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            # HTTP-date form
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
     
     def should_retry(self, exception: Exception) -> bool:
         """
@@ -89,17 +131,23 @@ def with_retry(
     initial_delay: float = 1.0,
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
-    jitter: bool = True
+    jitter: bool = True,
+    max_total_delay: Union[float, Callable[[], float], None] = None
 ):
     """
     Decorator to add retry logic to async functions.
     
+    A Retry-After header on a retryable HTTP error (e.g. 429/503) sets the
+    minimum wait for that retry.
+    
     Args:
         max_attempts: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
         max_delay: Maximum delay in seconds
-        exponential_base: Base for exponential backoff
-        jitter: Whether to add random jitter
+        exponential_base: Base for exponential backoff (without jitter)
+        jitter: Whether to use decorrelated-jitter delays
+        max_total_delay: Budget in seconds (or callable returning it) for all
+            waits of one call together
     
     Returns:
         Decorated function with retry logic
@@ -109,13 +157,17 @@ def with_retry(
         initial_delay=initial_delay,
         max_delay=max_delay,
         exponential_base=exponential_base,
-        jitter=jitter
+        jitter=jitter,
+        max_total_delay=max_total_delay
     )
     
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         async def wrapper(*args, **kwargs):
             last_exception = None
+            prev_delay = None
+            waited = 0.0
+            budget = policy.total_delay_budget()
             
             for attempt in range(policy.max_attempts):
                 try:
@@ -133,7 +185,23 @@ def with_retry(
                         raise
                     
                     if attempt < policy.max_attempts - 1:
-                        delay = policy.calculate_delay(attempt)
+                        delay = policy.calculate_delay(attempt, prev_delay)
+                        retry_after = policy.retry_after(e)
+                        if retry_after is not None:
+                            delay = max(delay, retry_after)
+                        if budget is not None and waited + delay > budget:
+                            logger.error(
+                                "retry_budget_exhausted",
+                                function=func.__name__,
+                                attempt=attempt + 1,
+                                waited_seconds=round(waited, 2),
+                                next_delay_seconds=round(delay, 2),
+                                budget_seconds=budget,
+                                error=str(e)
+                            )
+                            raise
+                        prev_delay = delay
+                        waited += delay
                         logger.warning(
                             "retry_attempt",
                             function=func.__name__,
@@ -57,6 +57,11 @@ def setup_logging(
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
+        # Calls below the configured level return immediately, before any
+        # event dict is built or processor runs (debug logs in hot paths are free)
+        wrapper_class=structlog.make_filtering_bound_logger(
+            getattr(logging, log_level.upper(), logging.INFO)
+        ),
         cache_logger_on_first_use=True,
     )
     
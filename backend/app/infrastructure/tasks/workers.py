@@ -198,6 +198,7 @@ def cleanup_old_files(self, days: int = 30) -> Dict:
     """
     try:
         from datetime import datetime, timedelta
+        from app.services.file_service import prune_unreferenced_blobs
         
         logger.info(
             "file_cleanup_started",
@@ -231,6 +232,9 @@ def cleanup_old_files(self, days: int = 30) -> Dict:
                             error=str(e)
                         )
         
+        # Content blobs whose uploads have all been deleted
+        deleted_count += prune_unreferenced_blobs(upload_dir)
+        
         result = {
             "status": "completed",
             "deleted_count": deleted_count,
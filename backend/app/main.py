@@ -1,5 +1,6 @@
 # File: backend/app/main.py
 # Purpose: FastAPI application entry point with all components integrated
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,6 +13,7 @@ from app.config import get_settings
 from app.infrastructure.logging.setup import setup_logging
 from app.infrastructure.database.connection import init_db, close_db
 from app.infrastructure.cache.redis_client import init_redis, close_redis
+from app.dependencies import warm_up_singletons
 from app.infrastructure.tracing.opentelemetry_setup import setup_tracing
 from app.middleware.request_id import RequestIDMiddleware, RequestLoggingMiddleware
 from app.middleware.metrics import MetricsMiddleware, get_metrics_collector
@@ -45,7 +47,9 @@ async def lifespan(app: FastAPI):
         "application_starting",
         env=settings.ENV,
         debug=settings.DEBUG,
-        log_level=settings.LOG_LEVEL
+        log_level=settings.LOG_LEVEL,
+        # uvicorn's "auto" loop picks uvloop when it is installed (uvicorn[standard])
+        event_loop=type(asyncio.get_running_loop()).__module__
     )
     
     try:
@@ -64,6 +68,16 @@ async def lifespan(app: FastAPI):
             )
             # Redis is optional - application can run without it
         
+        # Build the LLM client and tool registry now so the first chat turn doesn't pay for them
+        try:
+            await warm_up_singletons(settings)
+        except Exception as warmup_error:
+            logger.warning(
+                "singleton_warmup_failed",
+                error=str(warmup_error)
+            )
+            # Not fatal - the singletons are also built lazily on first use
+        
         # Setup tracing (optional)
         setup_tracing(
             service_name=settings.APP_NAME,
@@ -252,5 +266,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        loop="uvloop",
+        http="httptools"
     )
@@ -1,10 +1,14 @@
 # File: backend/app/services/chat_service.py
 # Purpose: Chat service orchestrating agent, memory, and tools
-import base64
+import binascii
+import re
 from pathlib import Path
-from typing import Optional, AsyncIterator, List
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, AsyncIterator, Iterator, List
 import structlog
 import asyncio
+import time
 
 from app.services.llm_service import LLMService
 from app.services.session_service import SessionService
@@ -16,14 +20,15 @@ from app.config import Settings
 from app.core.agent.orchestrator import AgentOrchestrator
 from app.core.tools.registry import ToolRegistry
 from app.infrastructure.database.connection import get_session_maker
-from agent.tools.mac_tools import build_default_tools
-from datetime import datetime
-import json
+from app.infrastructure.cache.response_cache import ResponseCache
+from app.utils.json_utils import json_dumps
+from app.utils.clock import now_iso
+from app.core.buffers import scratch_buffers
+from datetime import datetime, timezone
+from textwrap import dedent
 
 logger = structlog.get_logger(__name__)
 
-from textwrap import dedent
-
 
 # ============================================================================
 # Base System Prompt - 基础系统提示词
@@ -96,6 +101,254 @@ BASE_SYSTEM_PROMPT = dedent("""
 """).strip()
 
 
+_ATTACHMENT_CONTEXT_HEADER = "附件内容:\n"
+
+
+# Small on purpose: attachment contexts can be large extracted documents,
+# and a repeat only happens when the same files are resent
+@lru_cache(maxsize=32)
+def _assemble_system_prompt(memory_context: str, attachment_context: str) -> str:
+    """Append memory and attachment context to the base prompt (memoized)."""
+    prompt_parts = [BASE_SYSTEM_PROMPT]
+
+    if memory_context:
+        prompt_parts.append(memory_context)
+
+    if attachment_context:
+        prompt_parts.append(_ATTACHMENT_CONTEXT_HEADER + attachment_context)
+
+    return "\n\n".join(prompt_parts)
+
+
+_datetime_now = datetime.now
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the database models."""
+    return _datetime_now(timezone.utc).replace(tzinfo=None)
+
+
+# Explicit "remember this" phrases that force an update_memory tool call;
+# one alternation scans the message once instead of once per phrase
+MEMORY_TRIGGER_PHRASES = ("请记住", "记住这", "记住：", "记住:", "我的爱好", "我喜欢")
+_MEMORY_TRIGGER_RE = re.compile("|".join(map(re.escape, MEMORY_TRIGGER_PHRASES)))
+
+
+# Number of stored messages sent back to the model as conversation context
+HISTORY_WINDOW = 10
+
+
+def _recent_history(messages: List[dict], limit: int = HISTORY_WINDOW) -> Iterator[dict]:
+    """
+    Yield the last `limit` user/assistant messages as LLM chat messages.
+
+    The session is loaded before the current turn is persisted, so every
+    stored message is prior context.
+    """
+    start = max(0, len(messages) - limit)
+    return (
+        {"role": hist_msg["role"], "content": hist_msg.get("content", "")}
+        for hist_msg in islice(messages, start, None)
+        if hist_msg.get("role") in ("user", "assistant")
+    )
+
+
+async def _replay_reply(content: str) -> AsyncIterator[dict]:
+    """Emit a cached reply as a content event, the way a live stream would."""
+    yield {"type": "content", "content": content}
+
+
+# Process-wide reply cache and tool registry (ChatService itself is created per request)
+_response_cache: Optional[ResponseCache] = None
+_tool_registry: Optional[ToolRegistry] = None
+
+
+def _get_response_cache(settings: Settings) -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(ttl=settings.LLM_CACHE_TTL)
+    return _response_cache
+
+
+def get_tool_registry(settings: Settings) -> ToolRegistry:
+    """
+    Return the process-wide tool registry, building it on first use.
+
+    ChatService is created per request, but the tool set (and therefore
+    its OpenAI schema list) never changes, so it is built only once.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Shared tool registry
+    """
+    global _tool_registry
+    if _tool_registry is None:
+        _tool_registry = _build_tool_registry(settings)
+    return _tool_registry
+
+
+def _build_tool_registry(settings: Settings) -> ToolRegistry:
+    """Build tool registry with database session factory and celery app injected."""
+    # Imported lazily: the tool modules are heavy and only needed once per process
+    from agent.tools.mac_tools import build_default_tools
+
+    tools = build_default_tools()
+    session_maker = get_session_maker(settings)
+
+    # Import celery app
+    from app.infrastructure.tasks.celery_app import celery_app
+
+    # Inject dependencies into tools
+    for tool in tools:
+        tool_name = getattr(tool, "name", "")
+
+        # Inject db_session_factory for memory and delegation tools
+        if tool_name in ("update_memory", "delegate_task", "check_delegated_tasks"):
+            tool.db_session_factory = session_maker
+
+        # Inject celery_app for delegation tool
+        if tool_name == "delegate_task":
+            tool.celery_app = celery_app
+
+    return ToolRegistry(tools)
+
+
+def _user_content(message: str, image_parts: List[dict]) -> str | List[dict]:
+    """Plain text content, or a multimodal part list when images are attached."""
+    if not image_parts:
+        return message
+    return [{"type": "text", "text": message}, *image_parts]
+
+
+class _ContentCoalescer:
+    """
+    Merge small LLM content deltas into fewer content events.
+
+    A delta is emitted at once when the previous emit is older than
+    `max_delay` seconds, so slow streams are unaffected; fast streams are
+    batched until `min_chars` characters have accumulated.
+    """
+
+    def __init__(self, min_chars: int = 32, max_delay: float = 0.02):
+        self.min_chars = min_chars
+        self.max_delay = max_delay
+        self._parts: List[str] = []
+        self._size = 0
+        self._last_flush = 0.0
+
+    def add(self, text: str) -> Optional[str]:
+        """Buffer `text`; return the coalesced content when it is due."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.min_chars or time.monotonic() - self._last_flush >= self.max_delay:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Return and clear any buffered content."""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._last_flush = time.monotonic()
+        return text
+
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background_task(coro, name: Optional[str] = None) -> asyncio.Task:
+    """Run a coroutine in the background, logging any unhandled exception."""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
+    return task
+
+
+def _on_background_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "background_task_failed",
+            task_name=task.get_name(),
+            error=str(task.exception())
+        )
+
+
+# Number of TTS segments synthesized concurrently per reply
+TTS_MAX_CONCURRENCY = 3
+
+# TextSegmenter thresholds (characters). Segments are synthesized concurrently,
+# so a short first segment buys early audio without serializing later ones.
+TTS_SEGMENTER_CONFIG = {"min_length": 10, "max_length": 200, "prefer_length": 50}
+
+# Event types produced by ChatService._stream_with_tts
+_TTS_EVENT_TYPES = frozenset({"tts_segment_start", "tts_audio", "tts_segment_end", "tts_error"})
+
+# End-of-stream marker on the _stream_with_tts output queue
+_PUMP_DONE = object()
+
+# Markdown exports waiting out their debounce window, keyed by session ID
+_pending_exports: dict[str, asyncio.Task] = {}
+EXPORT_DEBOUNCE_S = 0.5
+
+
+# Multiple of 3 so every chunk except the last encodes without padding
+_IMAGE_READ_CHUNK = 3 * 21 * 1024
+
+
+def encode_file_b64(path: Path, prefix: bytes = b"") -> bytearray:
+    """
+    Base64-encode a file into a single pre-sized buffer (blocking).
+
+    The file is read through a pooled scratch buffer and each chunk is
+    encoded straight into the output, so neither the raw file nor an
+    intermediate encoded copy is ever held in memory.
+
+    Args:
+        path: File to encode
+        prefix: Bytes to place before the encoded data (e.g. a data URL header)
+
+    Returns:
+        prefix followed by the base64 encoding of the file
+    """
+    size = path.stat().st_size
+    out = bytearray(len(prefix) + (size + 2) // 3 * 4)
+    out[:len(prefix)] = prefix
+    pos = len(prefix)
+
+    with scratch_buffers.acquire(_IMAGE_READ_CHUNK) as scratch, \
+            memoryview(scratch)[:_IMAGE_READ_CHUNK] as view, \
+            path.open("rb") as f:
+        while True:
+            # Fill the whole chunk: a short read mid-file would emit padding
+            filled = 0
+            while filled < _IMAGE_READ_CHUNK:
+                n = f.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+            if not filled:
+                break
+            encoded = binascii.b2a_base64(view[:filled], newline=False)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+            if filled < _IMAGE_READ_CHUNK:
+                break
+
+    # The file may have shrunk since stat(); drop the unused tail
+    del out[pos:]
+    return out
+
+
+def _encode_image_data_url(path: Path, content_type: str) -> str:
+    """Encode an image file as a base64 data URL (blocking)."""
+    prefix = f"data:{content_type or 'image/png'};base64,".encode("ascii")
+    return encode_file_b64(path, prefix).decode("ascii")
 
 
 class ChatService:
@@ -131,29 +384,7 @@ class ChatService:
         self.files = file_service
         self.conversation_history = conversation_history_service
         self.settings = settings
-        self.tool_registry = self._build_tool_registry()
-
-    def _build_tool_registry(self) -> ToolRegistry:
-        """Build tool registry with database session factory and celery app injected."""
-        tools = build_default_tools()
-        session_maker = get_session_maker(self.settings)
-
-        # Import celery app
-        from app.infrastructure.tasks.celery_app import celery_app
-
-        # Inject dependencies into tools
-        for tool in tools:
-            tool_name = getattr(tool, "name", "")
-
-            # Inject db_session_factory for memory and delegation tools
-            if tool_name in ("update_memory", "delegate_task", "check_delegated_tasks"):
-                tool.db_session_factory = session_maker
-
-            # Inject celery_app for delegation tool
-            if tool_name == "delegate_task":
-                tool.celery_app = celery_app
-
-        return ToolRegistry(tools)
+        self.tool_registry = get_tool_registry(settings)
     
     async def process_chat_message(
         self,
@@ -176,10 +407,13 @@ class ChatService:
             message: User message
             model: Optional model override
             attachments: Optional file attachments
-            stream: Whether to stream response
+            stream: Kept for API compatibility; replies are always streamed
+            tts_enabled: Whether to synthesize speech for the reply
+            tts_voice: TTS voice
+            tts_model: TTS model
         
         Yields:
-            Event dictionaries (content, tool_start, tool_result, error)
+            Event dictionaries (content, tool_start, tool_result, tts_*, error)
         """
         try:
             # Use tool-enabled pipeline for all requests
@@ -195,247 +429,7 @@ class ChatService:
                 tts_model=tts_model
             ):
                 yield event
-            return
-            logger.info(
-                "chat_process_enter",
-                user_id=user_id,
-                session_id=session_id,
-                message_length=len(message),
-                stream=stream,
-                tts_enabled=tts_enabled,
-            )
-
-            # Get or create session
-            logger.info(
-                "chat_load_session_start",
-                user_id=user_id,
-                session_id=session_id,
-            )
-            session = await self.sessions.get_session(
-                user_id=user_id,
-                session_id=session_id,
-                load_messages=True
-            )
-            logger.info(
-                "chat_load_session_done",
-                user_id=user_id,
-                session_id=session_id,
-                found=bool(session),
-                loaded_message_count=len(session.get("messages", [])) if session else 0,
-            )
-            
-            if not session:
-                yield {
-                    "type": "error",
-                    "error": f"Session not found: {session_id}"
-                }
-                return
-            
-            # Update session title if it's a new session
-            if session.get("title") == "新会话" and not session.get("messages"):
-                logger.info(
-                    "chat_update_session_title_start",
-                    user_id=user_id,
-                    session_id=session_id,
-                )
-                title = self.sessions.create_session_title(message)
-                await self.sessions.update_session_title(
-                    user_id=user_id,
-                    session_id=session_id,
-                    title=title
-                )
-                logger.info(
-                    "chat_update_session_title_done",
-                    user_id=user_id,
-                    session_id=session_id,
-                )
-            
-            # Add user message to session with timestamp
-            user_msg_timestamp = datetime.utcnow()
-            logger.info(
-                "chat_add_user_message_start",
-                user_id=user_id,
-                session_id=session_id,
-            )
-            await self.sessions.add_message(
-                session_id=session_id,
-                role="user",
-                content=message,
-                metadata={"timestamp": user_msg_timestamp.isoformat()}
-            )
-            logger.info(
-                "chat_add_user_message_done",
-                user_id=user_id,
-                session_id=session_id,
-            )
-            
-            # Process attachments
-            attachment_context = ""
-            image_parts = []
-            
-            if attachments:
-                attachment_context, image_parts = await self._process_attachments(
-                    attachments
-                )
-            
-            # Memory context is now handled by Agent's update_memory tool
-            memory_context = ""
-
-            # Build messages for LLM
-            messages = self._build_llm_messages(
-                message=message,
-                attachment_context=attachment_context,
-                image_parts=image_parts,
-                history=session.get("messages", [])[-10:],  # Last 10 messages
-                memory_context=memory_context
-            )
-            
-            # Determine model
-            model = model or self.settings.OPENAI_MODEL
-            
-            # Validate model
-            if not self.settings.is_model_allowed(model):
-                yield {
-                    "type": "error",
-                    "error": f"Model not allowed: {model}"
-                }
-                return
-            
-            logger.info(
-                "chat_processing_started",
-                user_id=user_id,
-                session_id=session_id,
-                model=model,
-                message_length=len(message),
-                has_attachments=bool(attachments)
-            )
-            
-            # Stream LLM response
-            assistant_content = ""
-            
-            # 初始化TTS分段器（如果启用）
-            segmenter = None
-            segment_id = 0
-            tts_tasks = []
-            
-            if tts_enabled:
-                segmenter = TextSegmenter(
-                    min_length=10,
-                    max_length=200,
-                    prefer_length=50
-                )
-            
-            if stream:
-                # Get async generator directly from streaming method
-                response = self.llm._chat_completion_stream(
-                    messages=messages,
-                    model=model
-                )
-                
-                async for chunk in response:
-                    choices = chunk.get("choices", [])
-                    if not choices:
-                        continue
-                    
-                    delta = choices[0].get("delta", {})
-                    content = delta.get("content")
-                    
-                    if content:
-                        assistant_content += content
-                        yield {
-                            "type": "content",
-                            "content": content
-                        }
-                        
-                        # TTS分段处理
-                        if segmenter:
-                            segments = segmenter.add_text(content)
-                            for segment_text in segments:
-                                current_segment_id = segment_id
-                                segment_id += 1
-                                
-                                # 记录需要合成的段落信息
-                                tts_tasks.append({
-                                    "segment_text": segment_text,
-                                    "segment_id": current_segment_id,
-                                    "tts_voice": tts_voice,
-                                    "tts_model": tts_model
-                                })
-            else:
-                response = await self.llm.chat_completion(
-                    messages=messages,
-                    model=model,
-                    stream=False,
-                    use_cache=True
-                )
-                
-                assistant_content = response["choices"][0]["message"]["content"]
-                yield {
-                    "type": "content",
-                    "content": assistant_content
-                }
-            
-            # 处理剩余的文本片段（刷新缓冲区）
-            if segmenter:
-                final_segment = segmenter.flush()
-                if final_segment:
-                    current_segment_id = segment_id
-                    segment_id += 1
-                    
-                    tts_tasks.append({
-                        "segment_text": final_segment,
-                        "segment_id": current_segment_id,
-                        "tts_voice": tts_voice,
-                        "tts_model": tts_model
-                    })
-            
-            # 按顺序合成并返回TTS音频事件
-            for task_info in tts_tasks:
-                async for tts_event in self._synthesize_and_stream_segment(
-                    segment_text=task_info["segment_text"],
-                    segment_id=task_info["segment_id"],
-                    tts_voice=task_info["tts_voice"],
-                    tts_model=task_info["tts_model"]
-                ):
-                    yield tts_event
-            
-            # Save assistant message with timestamp
-            assistant_msg_timestamp = datetime.utcnow()
-            await self.sessions.add_message(
-                session_id=session_id,
-                role="assistant",
-                content=assistant_content,
-                metadata={"timestamp": assistant_msg_timestamp.isoformat()}
-            )
-
-            # Memory extraction is now handled by Agent's update_memory tool
-            # Agent will automatically call update_memory when it identifies important information
-
-            # Export conversation history to Markdown files
-            try:
-                system_prompt = self._build_system_prompt()
-                await self.conversation_history.export_session_to_markdown(
-                    session_id=session_id,
-                    system_prompt=system_prompt
-                )
-                logger.info(
-                    "conversation_exported",
-                    session_id=session_id
-                )
-            except Exception as export_error:
-                logger.error(
-                    "conversation_export_failed",
-                    session_id=session_id,
-                    error=str(export_error)
-                )
 
-            logger.info(
-                "chat_processing_completed",
-                user_id=user_id,
-                session_id=session_id,
-                response_length=len(assistant_content)
-            )
-            
         except Exception as e:
             logger.error(
                 "chat_processing_failed",
@@ -456,6 +450,9 @@ class ChatService:
     ) -> tuple[str, List[dict]]:
         """
         Process file attachments.
+
+        Attachments are read concurrently in worker threads so disk I/O and
+        base64 encoding never block the event loop.
         
         Args:
             attachments: List of attachment metadata
@@ -463,97 +460,77 @@ class ChatService:
         Returns:
             Tuple of (text_context, image_parts)
         """
-        context_parts = []
+        results = await asyncio.gather(
+            *(self._process_attachment(attachment) for attachment in attachments)
+        )
+
+        # Text sections are gathered as pieces and joined once, without a
+        # per-file "文件: name\ntext" temporary
+        context_pieces = []
         image_parts = []
-        
-        for attachment in attachments:
-            file_id = attachment.get("file_id")
-            if not file_id:
-                continue
-            
-            # Get file info (in production, this would query a database)
-            # For now, we'll assume the file path is provided
-            file_path = attachment.get("path")
-            if not file_path:
-                continue
-            
-            path = Path(file_path)
-            if not path.exists():
+
+        for result in results:
+            if result is None:
                 continue
-            
-            # Check if image
-            content_type = attachment.get("content_type", "")
-            if self.files.is_image_file(path, content_type):
-                # Read and encode image
-                raw = path.read_bytes()
-                encoded = base64.b64encode(raw).decode("ascii")
-                image_url = f"data:{content_type or 'image/png'};base64,{encoded}"
-                image_parts.append({
-                    "type": "image_url",
-                    "image_url": {"url": image_url}
-                })
+            kind, value = result
+            if kind == "image":
+                image_parts.append(value)
             else:
-                # Extract text
-                text = self.files.extract_text(path)
-                if text:
-                    filename = attachment.get("filename", path.name)
-                    context_parts.append(f"文件: {filename}\n{text}")
+                filename, text = value
+                if context_pieces:
+                    context_pieces.append("\n\n")
+                context_pieces += ("文件: ", filename, "\n", text)
         
-        context = "\n\n".join(context_parts).strip()
+        context = "".join(context_pieces).strip()
         return context, image_parts
-    
-    def _build_llm_messages(
-        self,
-        message: str,
-        attachment_context: str,
-        image_parts: List[dict],
-        history: List[dict],
-        memory_context: str = ""
-    ) -> List[dict]:
+
+    async def _process_attachment(self, attachment: dict) -> Optional[tuple[str, object]]:
         """
-        Build messages array for LLM API.
+        Process a single attachment in a worker thread.
+
+        The whole body (existence check, read, encode or text extraction)
+        runs in one thread hop rather than one per blocking call.
 
         Args:
-            message: Current user message
-            attachment_context: Text from attachments
-            image_parts: Image attachments
-            history: Recent message history
-            memory_context: User memory context
+            attachment: Attachment metadata
 
         Returns:
-            List of message dictionaries
+            ("image", image_part) or ("text", (filename, text)), None if skipped
         """
-        messages = [
-            {
-                "role": "system",
-                "content": self._build_system_prompt(attachment_context, memory_context)
-            }
-        ]
-        
-        # Add recent history (excluding current message)
-        for hist_msg in history[:-1]:  # Exclude the last message (current user message)
-            if hist_msg.get("role") in ["user", "assistant"]:
-                messages.append({
-                    "role": hist_msg["role"],
-                    "content": hist_msg.get("content", "")
-                })
+        return await asyncio.to_thread(self._read_attachment, attachment)
+
+    def _read_attachment(self, attachment: dict) -> Optional[tuple[str, object]]:
+        """Blocking body of _process_attachment."""
+        file_id = attachment.get("file_id")
+        if not file_id:
+            return None
         
-        # Add current user message
-        if image_parts:
-            # Multimodal message
-            user_content = [
-                {"type": "text", "text": message},
-                *image_parts
-            ]
-        else:
-            user_content = message
+        # Get file info (in production, this would query a database)
+        # For now, we'll assume the file path is provided
+        file_path = attachment.get("path")
+        if not file_path:
+            return None
         
-        messages.append({
-            "role": "user",
-            "content": user_content
-        })
+        path = Path(file_path)
+        if not path.exists():
+            return None
         
-        return messages
+        # Check if image
+        content_type = attachment.get("content_type", "")
+        if self.files.is_image_file(path, content_type):
+            # Read and encode image
+            image_url = _encode_image_data_url(path, content_type)
+            return "image", {
+                "type": "image_url",
+                "image_url": {"url": image_url}
+            }
+
+        # Extract text
+        text = self.files.extract_text(path)
+        if not text:
+            return None
+        filename = attachment.get("filename", path.name)
+        return "text", (filename, text)
     
     def _build_system_prompt(
         self,
@@ -570,18 +547,324 @@ class ChatService:
         Returns:
             System prompt string
         """
-        base_prompt = BASE_SYSTEM_PROMPT
+        if not memory_context and not attachment_context:
+            return BASE_SYSTEM_PROMPT
+        return _assemble_system_prompt(memory_context, attachment_context)
+    
+    def _build_user_message(self, message: str) -> dict:
+        """
+        Build the user message record, timestamped on arrival.
+
+        Args:
+            message: User message
 
-        prompt_parts = [base_prompt]
+        Returns:
+            Message dict for SessionService.add_messages
+        """
+        user_msg_timestamp = _utcnow()
+        return {
+            "role": "user",
+            "content": message,
+            "created_at": user_msg_timestamp,
+            "metadata": {"timestamp": user_msg_timestamp.isoformat()}
+        }
 
-        if memory_context:
-            prompt_parts.append(f"\n\n{memory_context}")
+    async def _begin_turn(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        attachments: Optional[List[dict]]
+    ) -> Optional[tuple[dict, str, List[dict], str, str]]:
+        """
+        Shared prelude of a chat turn: load the session and its recent history
+        window, set its title and build the system prompt.
 
-        if attachment_context:
-            prompt_parts.append(f"\n\n附件内容:\n{attachment_context}")
+        Args:
+            user_id: User ID
+            session_id: Session ID
+            message: User message
+            attachments: Optional file attachments
+
+        Returns:
+            Tuple of (session, attachment_context, image_parts, memory_context,
+            system_prompt), or None if the session does not exist
+        """
+        # Attachment reading is file I/O only, so it overlaps the session queries
+        attachment_result = ("", [])
+        if attachments:
+            session, attachment_result = await asyncio.gather(
+                self._load_session_window(user_id, session_id),
+                self._process_attachments(attachments),
+                return_exceptions=True
+            )
+            if isinstance(session, BaseException):
+                raise session
+        else:
+            session = await self._load_session_window(user_id, session_id)
+        if not session:
+            return None
+
+        # Update session title if it's a new session
+        if session.get("title") == "新会话" and not session.get("messages"):
+            title = self.sessions.create_session_title(message)
+            await self.sessions.update_session_title(
+                user_id=user_id,
+                session_id=session_id,
+                title=title
+            )
+
+        if isinstance(attachment_result, BaseException):
+            raise attachment_result
+        attachment_context, image_parts = attachment_result
+
+        # Memory context is now handled by Agent's update_memory tool
+        memory_context = ""
+
+        system_prompt = self._build_system_prompt(attachment_context, memory_context)
+        return session, attachment_context, image_parts, memory_context, system_prompt
+
+    async def _load_session_window(self, user_id: str, session_id: str) -> Optional[dict]:
+        """
+        Load the session with only its recent history window as "messages".
+
+        Args:
+            user_id: User ID
+            session_id: Session ID
+
+        Returns:
+            Session dictionary, or None if the session does not exist
+        """
+        session = await self.sessions.get_session(
+            user_id=user_id,
+            session_id=session_id
+        )
+        if not session:
+            return None
+
+        # Only the history window reaches the LLM; fetch just that slice
+        # (LIMIT over the (session_id, created_at) index) instead of every message
+        session["messages"] = await self.sessions.get_recent_messages(
+            session_id=session_id,
+            count=HISTORY_WINDOW
+        )
+        return session
+
+    async def _finalize_turn(
+        self,
+        session_id: str,
+        user_message: dict,
+        assistant_content: str,
+        tool_calls: Optional[List[dict]] = None,
+        tool_call_results: Optional[List[dict]] = None,
+        tool_call_timestamp: Optional[str] = None
+    ) -> None:
+        """
+        Shared epilogue of a chat turn: persist both messages and export in the background.
+
+        Args:
+            session_id: Session ID
+            user_message: Message dict from _build_user_message
+            assistant_content: Full assistant reply
+            tool_calls: Tool calls made during the turn
+            tool_call_results: Results of those tool calls
+            tool_call_timestamp: ISO timestamp of the first tool call
+        """
+        metadata = {"timestamp": now_iso()}
+        if tool_call_timestamp:
+            metadata["tool_call_timestamp"] = tool_call_timestamp
+
+        # Save user and assistant messages in a single write
+        await self.sessions.add_messages(
+            session_id=session_id,
+            messages=[
+                user_message,
+                {
+                    "role": "assistant",
+                    "content": assistant_content,
+                    "tool_calls": tool_calls or None,
+                    "tool_call_results": tool_call_results or None,
+                    "metadata": metadata
+                }
+            ]
+        )
+
+        # Memory extraction is now handled by Agent's update_memory tool
+        # Agent will automatically call update_memory when it identifies important information
+
+        # Export conversation history to Markdown files (in the background)
+        self._schedule_conversation_export(session_id)
+
+    async def _save_pending_user_message(self, session_id: str, user_message: dict) -> None:
+        """
+        Persist the user message alone when the turn failed before the reply was saved.
+
+        Args:
+            session_id: Session ID
+            user_message: Message dict from _build_user_message
+        """
+        try:
+            await self.sessions.add_messages(
+                session_id=session_id,
+                messages=[user_message]
+            )
+        except Exception as save_error:
+            logger.error(
+                "chat_user_message_save_failed",
+                session_id=session_id,
+                error=str(save_error)
+            )
+
+    def _schedule_conversation_export(self, session_id: str) -> None:
+        """
+        Export conversation history to Markdown without blocking the response.
+
+        Exports are debounced per session: a turn that ends while an earlier
+        export is still waiting replaces it, so a burst of turns is exported once.
+
+        Args:
+            session_id: Session ID
+        """
+        pending = _pending_exports.pop(session_id, None)
+        if pending is not None:
+            pending.cancel()
+        _pending_exports[session_id] = _spawn_background_task(
+            self._export_conversation(session_id, delay=EXPORT_DEBOUNCE_S),
+            name=f"conversation_export:{session_id}"
+        )
+
+    async def _export_conversation(self, session_id: str, delay: float = 0.0) -> None:
+        """
+        Export a session's conversation history to Markdown files.
+
+        Runs after the request has finished, so it uses its own database
+        session instead of the request-scoped one.
+
+        Args:
+            session_id: Session ID
+            delay: Debounce delay in seconds before exporting
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        # Past the debounce window: later turns schedule a fresh export instead of cancelling this one
+        if _pending_exports.get(session_id) is asyncio.current_task():
+            del _pending_exports[session_id]
+        try:
+            session_maker = get_session_maker(self.settings)
+            async with session_maker() as db:
+                history = ConversationHistoryService(
+                    db,
+                    self.conversation_history.markdown_exporter,
+                    base_path=self.conversation_history.base_path
+                )
+                # The export records the base prompt, without per-turn attachment context
+                await history.export_session_to_markdown(
+                    session_id=session_id,
+                    system_prompt=BASE_SYSTEM_PROMPT
+                )
+            logger.info(
+                "conversation_exported",
+                session_id=session_id
+            )
+        except Exception as export_error:
+            logger.error(
+                "conversation_export_failed",
+                session_id=session_id,
+                error=str(export_error)
+            )
+
+    async def _stream_with_tts(
+        self,
+        events: AsyncIterator[dict],
+        tts_voice: str,
+        tts_model: str,
+        max_concurrency: int = TTS_MAX_CONCURRENCY
+    ) -> AsyncIterator[dict]:
+        """
+        透传事件流，段落一成形就开始合成，TTS事件与内容事件交错输出
+
+        LLM事件流和TTS输出分别由两个任务驱动并写入同一个输出队列：
+        第一段音频在LLM仍在生成（或执行工具）时即可送达客户端。
+        TTS事件仍按 segment_id 顺序输出；仅在启用TTS时包装事件流。
+
+        Args:
+            events: 包含 content 事件的事件流
+            tts_voice: TTS音色
+            tts_model: TTS模型
+            max_concurrency: 同时进行的合成数量上限
+
+        Yields:
+            原始事件与TTS事件字典
+        """
+        segmenter = TextSegmenter(**TTS_SEGMENTER_CONFIG)
+        # 热循环中使用局部变量，避免每个token重复查找属性
+        add_text = segmenter.add_text
+        semaphore = asyncio.Semaphore(max_concurrency)
+        output: asyncio.Queue = asyncio.Queue()
+        # 每个段落一个事件队列，按提交顺序排列；None 表示不再有新段落
+        segment_queues: asyncio.Queue = asyncio.Queue()
+        producers: List[asyncio.Task] = []
+
+        async def synthesize(segment_text: str, segment_id: int, queue: asyncio.Queue) -> None:
+            # 信号量按等待顺序唤醒，靠前的段落优先合成
+            async with semaphore:
+                try:
+                    async for tts_event in self._synthesize_and_stream_segment(
+                        segment_text=segment_text,
+                        segment_id=segment_id,
+                        tts_voice=tts_voice,
+                        tts_model=tts_model
+                    ):
+                        queue.put_nowait(tts_event)
+                finally:
+                    queue.put_nowait(None)  # 段落结束标记
+
+        def submit(segment_text: str) -> None:
+            queue = asyncio.Queue()
+            producers.append(asyncio.create_task(synthesize(segment_text, len(producers), queue)))
+            segment_queues.put_nowait(queue)
+
+        async def pump_events() -> None:
+            try:
+                async for event in events:
+                    output.put_nowait(event)
+                    if event.get("type") == "content":
+                        for segment_text in add_text(event.get("content", "")):
+                            submit(segment_text)
+                # 处理剩余的文本片段（刷新缓冲区）
+                final_segment = segmenter.flush()
+                if final_segment:
+                    submit(final_segment)
+            except Exception as exc:
+                output.put_nowait(exc)  # 交给消费方重新抛出
+            finally:
+                segment_queues.put_nowait(None)
+                output.put_nowait(_PUMP_DONE)
+
+        async def pump_tts() -> None:
+            try:
+                while (queue := await segment_queues.get()) is not None:
+                    while (tts_event := await queue.get()) is not None:
+                        output.put_nowait(tts_event)
+            finally:
+                output.put_nowait(_PUMP_DONE)
+
+        pumps = [asyncio.create_task(pump_events()), asyncio.create_task(pump_tts())]
+        try:
+            running = len(pumps)
+            while running:
+                item = await output.get()
+                if item is _PUMP_DONE:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # 出错或客户端断开时停止LLM读取和尚未完成的合成
+            for task in (*pumps, *producers):
+                task.cancel()
 
-        return "".join(prompt_parts)
-    
     async def _synthesize_and_stream_segment(
         self,
         segment_text: str,
@@ -609,16 +892,17 @@ class ChatService:
                 "text": segment_text
             }
             
-            # 流式合成音频
-            audio_chunks = []
+            # 流式合成音频（只计数，不保留已发送的音频块）
+            audio_chunks = 0
+            b2a_base64 = binascii.b2a_base64
             async for audio_chunk in synthesize_speech_stream(
                 text=segment_text,
                 model=tts_model,
                 voice=tts_voice
             ):
                 # 将音频数据编码为base64
-                audio_base64 = base64.b64encode(audio_chunk).decode('utf-8')
-                audio_chunks.append(audio_chunk)
+                audio_base64 = b2a_base64(audio_chunk, newline=False).decode('ascii')
+                audio_chunks += 1
                 
                 # 返回音频数据块
                 yield {
@@ -645,7 +929,7 @@ class ChatService:
                 "tts_segment_synthesized",
                 segment_id=segment_id,
                 text_length=len(segment_text),
-                audio_chunks=len(audio_chunks)
+                audio_chunks=audio_chunks
             )
             
         except Exception as e:
@@ -739,73 +1023,29 @@ class ChatService:
         Yields:
             Event dictionaries (content, tool_start, tool_result, error)
         """
+        started_ns = time.perf_counter_ns()
+        # Recorded on arrival and persisted together with the reply; until then
+        # every exit path (errors, client disconnects) saves it on its own
+        user_message = self._build_user_message(message)
         try:
-            # Get or create session
-            session = await self.sessions.get_session(
-                user_id=user_id,
-                session_id=session_id,
-                load_messages=True
-            )
-
-            if not session:
+            turn = await self._begin_turn(user_id, session_id, message, attachments)
+            if turn is None:
+                user_message = None
                 yield {
                     "type": "error",
                     "error": f"Session not found: {session_id}"
                 }
                 return
-
-            # Update session title if needed
-            if session.get("title") == "新会话" and not session.get("messages"):
-                title = self.sessions.create_session_title(message)
-                await self.sessions.update_session_title(
-                    user_id=user_id,
-                    session_id=session_id,
-                    title=title
-                )
-
-            # Add user message with timestamp
-            user_msg_timestamp = datetime.utcnow()
-            await self.sessions.add_message(
-                session_id=session_id,
-                role="user",
-                content=message,
-                metadata={"timestamp": user_msg_timestamp.isoformat()}
-            )
-
-            # Process attachments
-            attachment_context = ""
-            image_parts = []
-
-            if attachments:
-                attachment_context, image_parts = await self._process_attachments(
-                    attachments
-                )
+            session, _, image_parts, _, system_prompt = turn
 
             # Build user input
-            if image_parts:
-                user_input = [
-                    {"type": "text", "text": message},
-                    *image_parts
-                ]
-            else:
-                user_input = message
+            user_input = _user_content(message, image_parts)
 
             # Force memory tool call for explicit "remember" intent
-            memory_trigger_phrases = ["请记住", "记住这", "记住：", "记住:", "我的爱好", "我喜欢"]
-            should_force_memory_tool = any(phrase in message for phrase in memory_trigger_phrases)
+            should_force_memory_tool = _MEMORY_TRIGGER_RE.search(message) is not None
 
             # Get recent history for context
-            history = session.get("messages", [])[-10:]
-            extra_messages = []
-            for hist_msg in history[:-1]:  # Exclude current message
-                if hist_msg.get("role") in ["user", "assistant"]:
-                    extra_messages.append({
-                        "role": hist_msg["role"],
-                        "content": hist_msg.get("content", "")
-                    })
-
-            # Memory context is now handled by Agent's update_memory tool
-            memory_context = ""
+            extra_messages = list(_recent_history(session.get("messages", [])))
 
             # Determine model
             model = model or self.settings.OPENAI_MODEL
@@ -818,84 +1058,101 @@ class ChatService:
                 }
                 return
 
-            # Create agent orchestrator
-            llm_client = self.llm.client
-            system_prompt = self._build_system_prompt(attachment_context, memory_context)
-            orchestrator = AgentOrchestrator(
-                client=llm_client,
-                registry=tool_registry,
-                settings=self.settings,
-                system_prompt=system_prompt
-            )
-
-            # Run agent with tools
-            assistant_content = ""
+            # Exact-match reply cache; image and forced-memory turns always run the agent
+            response_cache = None
+            cache_key = None
+            cached_reply = None
+            if self.settings.CHAT_RESPONSE_CACHE_ENABLED and not image_parts and not should_force_memory_tool:
+                response_cache = _get_response_cache(self.settings)
+                cache_key = response_cache.make_key(user_id, model, system_prompt, extra_messages, message)
+                cached_reply = response_cache.get(cache_key)
+
+            # Run agent with tools; reply text is collected as parts and joined once
+            content_parts = []
             tool_calls = []
             tool_call_results = []
             tool_call_timestamp = None
-            
-            # 初始化TTS分段器（如果启用）
-            segmenter = None
-            segment_id = 0
-            tts_tasks = []
-            
-            if tts_enabled:
-                segmenter = TextSegmenter(
-                    min_length=10,
-                    max_length=200,
-                    prefer_length=50
-                )
 
-            async for event in orchestrator.run_stream(
-                user_input=user_input,
-                extra_messages=extra_messages,
-                model=model,
-                tool_context={"user_id": user_id, "session_id": session_id},
-                tool_choice=(
-                    {"type": "function", "function": {"name": "update_memory"}}
-                    if should_force_memory_tool
-                    else None
-                ),
-            ):
+            if cached_reply is not None:
+                logger.info(
+                    "chat_response_cache_hit",
+                    user_id=user_id,
+                    session_id=session_id,
+                    model=model
+                )
+                events = _replay_reply(cached_reply)
+            else:
+                # Create agent orchestrator
+                llm_client = self.llm.client
+                orchestrator = AgentOrchestrator(
+                    client=llm_client,
+                    registry=tool_registry,
+                    settings=self.settings,
+                    system_prompt=system_prompt
+                )
+                events = orchestrator.run_stream(
+                    user_input=user_input,
+                    extra_messages=extra_messages,
+                    model=model,
+                    tool_context={"user_id": user_id, "session_id": session_id},
+                    tool_choice=(
+                        {"type": "function", "function": {"name": "update_memory"}}
+                        if should_force_memory_tool
+                        else None
+                    ),
+                )
+            # TTS分段处理（仅在启用时包装事件流）
+            if tts_enabled:
+                events = self._stream_with_tts(events, tts_voice, tts_model)
+
+            content_buffer = _ContentCoalescer()
+            # Bind hot-loop lookups to locals once per turn
+            add_content = content_buffer.add
+            flush_content = content_buffer.flush
+            append_part = content_parts.append
+            append_tool_call = tool_calls.append
+            append_tool_result = tool_call_results.append
+            async for event in events:
                 event_type = event.get("type")
 
                 if event_type == "content":
                     content = event.get("content", "")
-                    assistant_content += content
+                    append_part(content)
+                    coalesced = add_content(content)
+                    if coalesced:
+                        yield {
+                            "type": "content",
+                            "content": coalesced
+                        }
+                    continue
+
+                if event_type in _TTS_EVENT_TYPES:
+                    yield event
+                    continue
+
+                # Emit buffered text before any tool event to keep ordering
+                pending = flush_content()
+                if pending:
                     yield {
                         "type": "content",
-                        "content": content
+                        "content": pending
                     }
-                    
-                    # TTS分段处理
-                    if segmenter:
-                        segments = segmenter.add_text(content)
-                        for segment_text in segments:
-                            current_segment_id = segment_id
-                            segment_id += 1
-                            
-                            # 记录需要合成的段落信息
-                            tts_tasks.append({
-                                "segment_text": segment_text,
-                                "segment_id": current_segment_id,
-                                "tts_voice": tts_voice,
-                                "tts_model": tts_model
-                            })
-
-                elif event_type == "tool_start":
+
+                if event_type == "tool_start":
                     # Record tool call timestamp
                     if tool_call_timestamp is None:
-                        tool_call_timestamp = datetime.utcnow()
+                        tool_call_timestamp = now_iso()
 
                     tool_call = {
                         "id": event.get("tool_call_id"),
                         "type": "function",
                         "function": {
                             "name": event.get("name"),
-                            "arguments": json.dumps(event.get("args", {}), ensure_ascii=False)
+                            # Store the model's own JSON text rather than re-encoding args
+                            "arguments": event.get("arguments") or json_dumps(event.get("args", {}))
                         }
                     }
-                    tool_calls.append(tool_call)
+                    append_tool_call(tool_call)
 
                     yield {
                         "type": "tool_start",
@@ -906,84 +1163,55 @@ class ChatService:
 
                 elif event_type == "tool_result":
                     result = event.get("result", {})
-                    tool_call_results.append(result)
+                    append_tool_result(result)
 
                     yield {
                         "type": "tool_result",
                         "tool_call_id": event.get("tool_call_id"),
                         "result": result
                     }
-            
-            # 处理剩余的文本片段（刷新缓冲区）
-            if segmenter:
-                final_segment = segmenter.flush()
-                if final_segment:
-                    current_segment_id = segment_id
-                    segment_id += 1
-                    
-                    tts_tasks.append({
-                        "segment_text": final_segment,
-                        "segment_id": current_segment_id,
-                        "tts_voice": tts_voice,
-                        "tts_model": tts_model
-                    })
-            
-            # 按顺序合成并返回TTS音频事件
-            for task_info in tts_tasks:
-                async for tts_event in self._synthesize_and_stream_segment(
-                    segment_text=task_info["segment_text"],
-                    segment_id=task_info["segment_id"],
-                    tts_voice=task_info["tts_voice"],
-                    tts_model=task_info["tts_model"]
-                ):
-                    yield tts_event
-
-            # Save assistant message with tool calls and results
-            assistant_msg_timestamp = datetime.utcnow()
-            metadata = {"timestamp": assistant_msg_timestamp.isoformat()}
-
-            if tool_call_timestamp:
-                metadata["tool_call_timestamp"] = tool_call_timestamp.isoformat()
-
-            await self.sessions.add_message(
-                session_id=session_id,
-                role="assistant",
-                content=assistant_content,
-                tool_calls=tool_calls if tool_calls else None,
-                tool_call_results=tool_call_results if tool_call_results else None,
-                metadata=metadata
-            )
 
-            # Memory extraction is now handled by Agent's update_memory tool
-            # Agent will automatically call update_memory when it identifies important information
+            remaining = content_buffer.flush()
+            if remaining:
+                yield {
+                    "type": "content",
+                    "content": remaining
+                }
 
-            # Export conversation history to Markdown files
-            try:
-                system_prompt = self._build_system_prompt()
-                await self.conversation_history.export_session_to_markdown(
-                    session_id=session_id,
-                    system_prompt=system_prompt
-                )
-                logger.info(
-                    "conversation_exported",
-                    session_id=session_id
-                )
-            except Exception as export_error:
-                logger.error(
-                    "conversation_export_failed",
-                    session_id=session_id,
-                    error=str(export_error)
-                )
+            assistant_content = "".join(content_parts)
+
+            # Only replies that used no tools are safe to replay
+            if cache_key is not None and cached_reply is None and assistant_content and not tool_calls:
+                response_cache.set(cache_key, assistant_content)
 
+            await self._finalize_turn(
+                session_id,
+                user_message,
+                assistant_content,
+                tool_calls=tool_calls,
+                tool_call_results=tool_call_results,
+                tool_call_timestamp=tool_call_timestamp
+            )
+            user_message = None
+
+            # One structured log per turn, covering start and end
             logger.info(
                 "chat_with_tools_completed",
                 user_id=user_id,
                 session_id=session_id,
+                model=model,
+                tts_enabled=tts_enabled,
+                message_length=len(message),
+                has_attachments=bool(attachments),
                 response_length=len(assistant_content),
-                tool_calls_count=len(tool_calls)
+                tool_calls_count=len(tool_calls),
+                duration_ms=(time.perf_counter_ns() - started_ns) // 1_000_000
             )
 
         except Exception as e:
+            if user_message is not None:
+                await self._save_pending_user_message(session_id, user_message)
+                user_message = None
             logger.error(
                 "chat_with_tools_failed",
                 user_id=user_id,
@@ -996,3 +1224,8 @@ class ChatService:
                 "type": "error",
                 "error": str(e)
             }
+        finally:
+            if user_message is not None:
+                # The client went away mid-turn (GeneratorExit / CancelledError skip
+                # the handler above): still keep what the user said
+                await asyncio.shield(self._save_pending_user_message(session_id, user_message))
@@ -1,14 +1,18 @@
 # File: backend/app/services/conversation_history_service.py
 # Purpose: Service for managing conversation history storage and export
 
+import asyncio
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import uuid
+from collections import Counter
 from datetime import datetime
+from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.database.repositories import MessageRepository, SessionRepository
 from app.services.markdown_exporter import MarkdownExporter
+from app.utils.clock import now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -59,14 +63,12 @@ class ConversationHistoryService:
         Returns:
             Message dictionary
         """
-        import uuid
-
         message_id = str(uuid.uuid4())
 
         # Prepare metadata with timestamp
         msg_metadata = metadata or {}
         if "timestamp" not in msg_metadata:
-            msg_metadata["timestamp"] = datetime.utcnow().isoformat()
+            msg_metadata["timestamp"] = now_iso()
 
         # Save to database
         message = await self.message_repo.create(
@@ -183,34 +185,56 @@ class ConversationHistoryService:
         Returns:
             List of message dictionaries
         """
-        session = await self.session_repo.get_by_id(session_id, load_messages=True)
-
-        if not session:
-            logger.warning(f"Session {session_id} not found")
-            return []
-
-        messages = []
-        for msg in session.messages:
-            if not include_system and msg.role == "system":
-                continue
-
-            messages.append({
-                "id": msg.id,
-                "session_id": msg.session_id,
-                "role": msg.role,
-                "content": msg.content,
-                "tool_calls": msg.tool_calls,
-                "tool_call_results": msg.tool_call_results,
-                "metadata": msg.message_metadata,
-                "created_at": msg.created_at.isoformat() if msg.created_at else None
-            })
-
-        return messages
+        rows = await self.message_repo.list_rows_by_session(session_id, include_system=include_system)
+        return [self._message_to_dict(row) for row in rows]
+
+    @staticmethod
+    def _message_to_dict(msg) -> Dict[str, Any]:
+        """Convert a Message (ORM object or column row) to the dictionary shape used for export"""
+        return {
+            "id": msg.id,
+            "session_id": msg.session_id,
+            "role": msg.role,
+            "content": msg.content,
+            "tool_calls": msg.tool_calls,
+            "tool_call_results": msg.tool_call_results,
+            "metadata": msg.message_metadata,
+            "created_at": msg.created_at.isoformat() if msg.created_at else None
+        }
+
+    async def _get_messages_after(
+        self,
+        session_id: str,
+        last_message_id: str,
+        last_message_at: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the non-system messages created after an already exported message
+
+        Args:
+            session_id: Session ID
+            last_message_id: ID of the last exported message
+            last_message_at: Its created_at as an ISO string
+
+        Returns:
+            Newer messages in order, or None if the exported message is gone
+        """
+        try:
+            since = datetime.fromisoformat(last_message_at)
+        except ValueError:
+            return None
+
+        rows = await self.message_repo.list_rows_by_session(session_id, include_system=False, since=since)
+        for index, row in enumerate(rows):
+            if row.id == last_message_id:
+                return [self._message_to_dict(msg) for msg in rows[index + 1:]]
+        return None
 
     async def export_session_to_markdown(
         self,
         session_id: str,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        force_full: bool = False
     ) -> Dict[str, str]:
         """
         Export a session's conversation history to Markdown files
@@ -218,33 +242,59 @@ class ConversationHistoryService:
         Args:
             session_id: Session ID
             system_prompt: System prompt to export (optional)
+            force_full: Rebuild the files from the whole history instead of
+                appending new messages (e.g. after messages were edited or deleted)
 
         Returns:
             Dictionary with file paths for each export type
         """
-        # Get all messages
-        messages = await self.get_session_messages(session_id, include_system=False)
-
         # Extract system prompt from messages if not provided
         if system_prompt is None:
-            session = await self.session_repo.get_by_id(session_id, load_messages=True)
-            if session and session.messages:
-                for msg in session.messages:
-                    if msg.role == "system":
-                        system_prompt = msg.content
-                        break
+            system_prompt = await self.message_repo.get_first_system_prompt(session_id)
 
         # Use default if still not found
         if system_prompt is None:
             system_prompt = "系统提示词未设置"
 
-        # Export all files
+        # Formatting and disk writes run in a worker thread
         try:
-            result = self.markdown_exporter.export_all(
-                session_id=session_id,
-                system_prompt=system_prompt,
-                messages=messages
-            )
+            result = None
+            # Append only the messages added since the last export, if there was one
+            state = None
+            if not force_full:
+                state = await asyncio.to_thread(self.markdown_exporter.read_export_state, session_id)
+            if state is not None:
+                new_messages = await self._get_messages_after(
+                    session_id, state["last_message_id"], state["last_message_at"]
+                )
+                if new_messages is not None:
+                    # A message saved late with an earlier created_at (e.g. overlapping
+                    # turns) is not "after" the last export; only a count catches it
+                    stored = await self.message_repo.count_by_session(session_id, include_system=False)
+                    if stored != state["message_count"] + len(new_messages):
+                        logger.info(
+                            f"Export of session {session_id} is out of sync "
+                            f"({state['message_count']} exported + {len(new_messages)} new, {stored} stored); "
+                            "rebuilding"
+                        )
+                        new_messages = None
+                if new_messages is not None:
+                    result = await asyncio.to_thread(
+                        self.markdown_exporter.append_messages,
+                        session_id=session_id,
+                        system_prompt=system_prompt,
+                        messages=new_messages,
+                        after_message_id=state["last_message_id"]
+                    )
+
+            if result is None:
+                messages = await self.get_session_messages(session_id, include_system=False)
+                result = await asyncio.to_thread(
+                    self.markdown_exporter.export_all,
+                    session_id=session_id,
+                    system_prompt=system_prompt,
+                    messages=messages
+                )
 
             logger.info(f"Exported conversation history for session {session_id}")
             return result
@@ -283,24 +333,37 @@ class ConversationHistoryService:
         Returns:
             Dictionary with conversation statistics
         """
+        aggregated = await self.session_repo.get_stats(session_id)
+        if aggregated is not None:
+            role_counts = aggregated["role_counts"]
+            first_at = aggregated["first_message_at"]
+            last_at = aggregated["last_message_at"]
+            return {
+                "total_messages": sum(role_counts.values()),
+                "user_messages": role_counts.get("user", 0),
+                "assistant_messages": role_counts.get("assistant", 0),
+                "tool_messages": role_counts.get("tool", 0),
+                "system_messages": role_counts.get("system", 0),
+                "total_tool_calls": aggregated["total_tool_calls"],
+                "first_message_at": first_at.isoformat() if first_at else None,
+                "last_message_at": last_at.isoformat() if last_at else None
+            }
+
+        # Dialects without JSON aggregation: count over the loaded messages
         messages = await self.get_session_messages(session_id, include_system=True)
+        role_counts = Counter(m["role"] for m in messages)
 
         stats = {
             "total_messages": len(messages),
-            "user_messages": sum(1 for m in messages if m["role"] == "user"),
-            "assistant_messages": sum(1 for m in messages if m["role"] == "assistant"),
-            "tool_messages": sum(1 for m in messages if m["role"] == "tool"),
-            "system_messages": sum(1 for m in messages if m["role"] == "system"),
-            "total_tool_calls": 0,
+            "user_messages": role_counts["user"],
+            "assistant_messages": role_counts["assistant"],
+            "tool_messages": role_counts["tool"],
+            "system_messages": role_counts["system"],
+            "total_tool_calls": sum(len(m["tool_calls"]) for m in messages if m.get("tool_calls")),
             "first_message_at": None,
             "last_message_at": None
         }
 
-        # Count tool calls
-        for msg in messages:
-            if msg.get("tool_calls"):
-                stats["total_tool_calls"] += len(msg["tool_calls"])
-
         # Get timestamps
         if messages:
             stats["first_message_at"] = messages[0].get("created_at")
@@ -1,14 +1,75 @@
 # File: backend/app/services/file_service.py
 # Purpose: File upload and processing service
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, BinaryIO
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple, BinaryIO
 import structlog
 
 from app.config import Settings
 
 logger = structlog.get_logger(__name__)
 
+# Extracted attachment text, keyed by (path, mtime_ns, size, text_limit) so an
+# edited file misses automatically. FileService is created per request, so the
+# cache is process-wide; entries are bounded by ATTACHMENT_TEXT_LIMIT.
+_TEXT_CACHE_SIZE = 32
+_text_cache: OrderedDict[tuple, str] = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+# Path separators, parent-directory references and NUL bytes in upload names
+_DANGEROUS_FILENAME_RE = re.compile(r"\.\.|[/\\\x00]")
+
+# Content-addressed copies of uploads, inside the upload directory. Every upload
+# is a hard link to its blob, so identical uploads share storage while each
+# keeps its own path that can be deleted independently.
+BLOB_DIR_NAME = ".blobs"
+
+
+def prune_unreferenced_blobs(upload_dir: Path) -> int:
+    """
+    Delete blobs that no upload links to anymore.
+
+    Args:
+        upload_dir: Upload directory
+
+    Returns:
+        Number of blobs deleted
+    """
+    deleted = 0
+    try:
+        entries = list(os.scandir(upload_dir / BLOB_DIR_NAME))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            # The blob's own name is the only remaining link
+            if entry.is_file(follow_symlinks=False) and entry.stat().st_nlink <= 1:
+                os.unlink(entry.path)
+                deleted += 1
+        except FileNotFoundError:
+            continue
+    return deleted
+
+
+@lru_cache(maxsize=8)
+def _resolved_dir_prefix(directory: str) -> str:
+    """
+    Resolve a directory once (FileService is created per request).
+
+    Returns:
+        Real path with a trailing separator, so sibling directories that
+        merely share the prefix (e.g. "uploads_old") do not match
+    """
+    return os.path.join(os.path.realpath(directory), "")
+
 
 class FileService:
     """
@@ -63,11 +124,8 @@ class FileService:
         # Sanitize filename
         safe_filename = self._sanitize_filename(filename)
         
-        # Create file path
-        file_path = self.upload_dir / f"{file_id}_{safe_filename}"
-        
-        # Save file
-        file_path.write_bytes(content)
+        # Save file (off the event loop: uploads can be tens of MB)
+        file_path = await asyncio.to_thread(self._store_content, file_id, safe_filename, content)
         
         metadata = {
             "id": file_id,
@@ -88,6 +146,56 @@ class FileService:
         
         return metadata
     
+    def _store_content(self, file_id: str, safe_filename: str, content: bytes) -> Path:
+        """
+        Write upload content to its own path, sharing storage with identical uploads.
+
+        Each upload gets ``{file_id}_{name}``. If a blob with the same
+        BLOB_DIR_NAME/{BLAKE2b-256 digest} exists, the upload is a hard link
+        to it instead of a new copy; otherwise the new file is registered as
+        the blob. Deleting one upload's path therefore never affects another
+        upload; prune_unreferenced_blobs drops blobs nothing links to.
+
+        Args:
+            file_id: Upload ID
+            safe_filename: Sanitized original filename
+            content: File content
+
+        Returns:
+            Path of the stored file
+        """
+        file_path = self.upload_dir / f"{file_id}_{safe_filename}"
+        blob_dir = self.upload_dir / BLOB_DIR_NAME
+        blob_path = blob_dir / hashlib.blake2b(content, digest_size=32).hexdigest()
+
+        try:
+            if blob_path.stat().st_size == len(content):
+                os.link(blob_path, file_path)
+                # Refresh mtime (shared by all links) so age-based cleanup keeps it
+                os.utime(file_path)
+                logger.info("file_upload_deduplicated", path=str(file_path))
+                return file_path
+        except OSError:
+            # No blob yet, or hard links unsupported: store a copy
+            pass
+
+        # Write then rename, so the path never holds a partial file
+        tmp_path = file_path.with_name(f".{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        try:
+            blob_dir.mkdir(exist_ok=True)
+            os.link(file_path, blob_path)
+        except OSError:
+            # A concurrent identical upload registered it first, or no hard links
+            pass
+        return file_path
+
     def is_image_file(self, path: Path, content_type: Optional[str] = None) -> bool:
         """
         Check if file is an image.
@@ -108,6 +216,9 @@ class FileService:
     def extract_text(self, file_path: Path) -> str:
         """
         Extract text from various file types.
+
+        Results are cached per file version, so an attachment resent on a
+        later turn is not parsed again (PDF/Word/Excel parsing is slow).
         
         Args:
             file_path: Path to file
@@ -115,6 +226,29 @@ class FileService:
         Returns:
             Extracted text (truncated if too long)
         """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return self._extract_text_uncached(file_path)
+
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size, self.text_limit)
+        with _text_cache_lock:
+            text = _text_cache.get(key)
+            if text is not None:
+                _text_cache.move_to_end(key)
+                return text
+
+        text = self._extract_text_uncached(file_path)
+        # Empty results may be a missing optional parser; don't pin them
+        if text:
+            with _text_cache_lock:
+                _text_cache[key] = text
+                while len(_text_cache) > _TEXT_CACHE_SIZE:
+                    _text_cache.popitem(last=False)
+        return text
+
+    def _extract_text_uncached(self, file_path: Path) -> str:
+        """Extract text without consulting the cache"""
         ext = file_path.suffix.lower()
         
         try:
@@ -139,23 +273,20 @@ class FileService:
             return ""
     
     def _extract_from_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF file"""
+        """
+        Extract text from PDF file, page by page.
+
+        Stops reading pages once the text limit is reached.
+        """
         try:
             import PyPDF2
-            
-            text_parts = []
-            with file_path.open("rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            
-            full_text = "\n\n".join(text_parts)
-            return self._truncate_text(full_text)
         except ImportError:
             logger.error("pypdf2_not_installed")
             return ""
+
+        with file_path.open("rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            return self._join_until_limit(page.extract_text() for page in reader.pages)
     
     def _extract_from_word(self, file_path: Path) -> str:
         """Extract text from Word document"""
@@ -163,14 +294,35 @@ class FileService:
             import docx
             
             doc = docx.Document(str(file_path))
-            text = "\n\n".join([para.text for para in doc.paragraphs if para.text])
-            return self._truncate_text(text)
+            return self._join_until_limit(para.text for para in doc.paragraphs)
         except ImportError:
             logger.error("python_docx_not_installed")
             return ""
     
     def _extract_from_excel(self, file_path: Path) -> str:
-        """Extract text from Excel file"""
+        """
+        Extract text from Excel file, one tab-separated line per row.
+
+        .xlsx rows are streamed with openpyxl in read-only mode and reading
+        stops once the text limit is reached; legacy .xls files go through pandas.
+        """
+        if file_path.suffix.lower() == ".xlsx":
+            try:
+                import openpyxl
+            except ImportError:
+                logger.error("openpyxl_not_installed")
+                return ""
+
+            workbook = openpyxl.load_workbook(str(file_path), read_only=True, data_only=True)
+            try:
+                sheets = (
+                    (sheet.title, sheet.iter_rows(values_only=True))
+                    for sheet in workbook.worksheets
+                )
+                return self._join_until_limit(self._iter_sheet_lines(sheets), "\n")
+            finally:
+                workbook.close()
+
         try:
             import pandas as pd
             
@@ -180,12 +332,58 @@ class FileService:
         except ImportError:
             logger.error("pandas_not_installed")
             return ""
+
+    @staticmethod
+    def _iter_sheet_lines(sheets: Iterable[Tuple[str, Iterable[Sequence[Any]]]]) -> Iterator[str]:
+        """
+        Render worksheet rows as text lines, lazily.
+
+        Args:
+            sheets: (sheet name, rows of cell values) pairs
+
+        Yields:
+            A "[sheet name]" line per sheet, then one tab-separated line per row
+        """
+        for name, rows in sheets:
+            yield f"[{name}]"
+            for row in rows:
+                yield "\t".join("" if value is None else str(value) for value in row).rstrip("\t")
     
     def _extract_from_text(self, file_path: Path) -> str:
-        """Extract text from plain text file"""
-        text = file_path.read_text(encoding="utf-8", errors="replace")
+        """
+        Extract text from plain text file.
+
+        Only the prefix that can fit in the text limit is read (a UTF-8
+        character is at most 4 bytes), plus one byte to detect truncation.
+        """
+        with file_path.open("rb") as f:
+            raw = f.read(self.text_limit * 4 + 1)
+        text = raw.decode("utf-8", errors="replace")
         return self._truncate_text(text)
     
+    def _join_until_limit(self, parts: Iterable[Optional[str]], separator: str = "\n\n") -> str:
+        """
+        Join non-empty text parts, consuming ``parts`` only until the text limit
+        is exceeded, then truncate.
+
+        Args:
+            parts: Lazily produced text (e.g. one entry per page)
+            separator: Separator placed between parts
+
+        Returns:
+            Joined text (truncated if too long)
+        """
+        kept = []
+        total = 0
+        for part in parts:
+            if not part:
+                continue
+            kept.append(part)
+            total += len(part) + len(separator)
+            if total > self.text_limit + len(separator):
+                break
+        return self._truncate_text(separator.join(kept))
+
     def _truncate_text(self, text: str) -> str:
         """Truncate text to configured limit"""
         if len(text) > self.text_limit:
@@ -205,22 +403,17 @@ class FileService:
         # Remove path components
         filename = Path(filename).name
         
-        # Remove or replace dangerous characters
-        dangerous_chars = ['/', '\\', '..', '\x00']
-        for char in dangerous_chars:
-            filename = filename.replace(char, '_')
+        # Replace dangerous characters in one pass
+        filename = _DANGEROUS_FILENAME_RE.sub('_', filename)
         
         # Limit length
         if len(filename) > 255:
-            name_part = filename[:200]
-            ext_part = Path(filename).suffix
-            filename = name_part + ext_part
+            filename = filename[:200] + Path(filename).suffix
         
         return filename or "unnamed_file"
     
     def _now_ms(self) -> int:
         """Get current timestamp in milliseconds"""
-        import time
         return int(time.time() * 1000)
     
     async def delete_file(self, file_path: str) -> bool:
@@ -234,10 +427,8 @@ class FileService:
             True if deleted successfully
         """
         try:
-            path = Path(file_path)
-            
             # Security check: ensure file is in upload directory
-            if not str(path.resolve()).startswith(str(self.upload_dir.resolve())):
+            if not os.path.realpath(file_path).startswith(_resolved_dir_prefix(str(self.upload_dir))):
                 logger.error(
                     "file_deletion_security_violation",
                     file_path=file_path,
@@ -245,12 +436,12 @@ class FileService:
                 )
                 return False
             
-            if path.exists():
-                path.unlink()
-                logger.info("file_deleted", file_path=file_path)
-                return True
-            
-            return False
+            try:
+                await asyncio.to_thread(os.unlink, file_path)
+            except FileNotFoundError:
+                return False
+            logger.info("file_deleted", file_path=file_path)
+            return True
         except Exception as e:
             logger.error(
                 "file_deletion_failed",
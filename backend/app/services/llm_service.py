@@ -1,16 +1,77 @@
 # File: backend/app/services/llm_service.py
 # Purpose: LLM service with caching, retry logic, and error handling
 import asyncio
+import binascii
+import json
 from typing import Optional, Union, AsyncIterator
 import structlog
 
 from app.infrastructure.llm.openai_client import OpenAIClient
+from app.infrastructure.llm.embedding_batcher import EmbeddingBatcher
 from app.infrastructure.cache.cache_manager import CacheManager
+from app.infrastructure.cache.semantic_cache import SemanticCache, normalize_query
 from app.infrastructure.llm.retry_policy import with_retry
-from app.config import Settings
+from app.config import Settings, get_settings
+from app.utils.vector_codec import decode_vectors, encode_vectors
 
 logger = structlog.get_logger(__name__)
 
+# Non-streaming completions currently in flight, keyed by request cache key.
+# Concurrent identical requests await the same call instead of each hitting the API.
+_inflight_completions: dict[str, asyncio.Future] = {}
+
+
+def _forget_inflight(key: str, task: asyncio.Future) -> None:
+    if _inflight_completions.get(key) is task:
+        del _inflight_completions[key]
+    # Mark the outcome as retrieved even if every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+# Process-wide semantic cache (LLMService is created per request)
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def _get_semantic_cache(settings: Settings) -> SemanticCache:
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            ttl=settings.LLM_CACHE_TTL
+        )
+    return _semantic_cache
+
+
+_SUMMARY_SYSTEM_PROMPT = "你是一个擅长总结的助手。请用简洁的中文总结以下内容，保留关键信息。"
+_SUMMARY_USER_TEMPLATE = "请总结以下内容（不超过{max_length}字）：\n\n{text}"
+
+# Process-wide embedding batchers, one per embedding model
+_embedding_batchers: dict[str, EmbeddingBatcher] = {}
+
+
+async def _embed_batch(
+    client: OpenAIClient,
+    texts: list[str],
+    model: str,
+    timeout: float
+) -> list[list[float]]:
+    """
+    Embed a batch of texts in one API call.
+
+    Args:
+        client: OpenAI-compatible client
+        texts: Texts to embed (at most EMBEDDING_MAX_BATCH)
+        model: Embedding model name
+        timeout: Request timeout in seconds
+
+    Returns:
+        Embedding vectors in input order
+    """
+    response = await client.create_embedding(texts, model, timeout=timeout)
+    data = sorted(response["data"], key=lambda item: item.get("index", 0))
+    return [item["embedding"] for item in data]
+
 
 class LLMService:
     """
@@ -79,15 +140,38 @@ class LLMService:
             )
         else:
             # Non-streaming with retry and caching
-            return await self._chat_completion_non_stream(
+            # Hash the request once; the in-flight map and the response cache share the key
+            key = None
+            if use_cache and (self.settings.LLM_CACHE_ENABLED or self.settings.LLM_INFLIGHT_DEDUP_ENABLED):
+                key = self.cache.llm_cache_key(
+                    messages, model, temperature, tools=tools, max_tokens=max_tokens, **kwargs
+                )
+            call_kwargs = dict(
                 messages=messages,
                 model=model,
                 tools=tools,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 use_cache=use_cache,
+                cache_key=key,
                 **kwargs
             )
+            if key is None or not self.settings.LLM_INFLIGHT_DEDUP_ENABLED:
+                return await self._chat_completion_non_stream(**call_kwargs)
+
+            task = _inflight_completions.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._chat_completion_non_stream(**call_kwargs))
+                _inflight_completions[key] = task
+                task.add_done_callback(lambda t: _forget_inflight(key, t))
+            else:
+                logger.info(
+                    "llm_inflight_request_shared",
+                    model=model,
+                    message_count=len(messages)
+                )
+            # Shield so one caller going away does not cancel the call for the others
+            return await asyncio.shield(task)
     
     def _chat_completion_stream(
         self,
@@ -129,7 +213,12 @@ class LLMService:
             **kwargs
         )
     
-    @with_retry(max_attempts=3, initial_delay=2.0, max_delay=10.0)
+    @with_retry(
+        max_attempts=3,
+        initial_delay=2.0,
+        max_delay=10.0,
+        max_total_delay=lambda: get_settings().LLM_REQUEST_TIMEOUT
+    )
     async def _chat_completion_non_stream(
         self,
         messages: list[dict],
@@ -138,6 +227,7 @@ class LLMService:
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
         use_cache: bool = True,
+        cache_key: Optional[str] = None,
         **kwargs
     ) -> dict:
         """
@@ -150,6 +240,7 @@ class LLMService:
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             use_cache: Whether to use caching
+            cache_key: Precomputed llm_cache_key for this request
             **kwargs: Additional parameters
         
         Returns:
@@ -161,7 +252,10 @@ class LLMService:
                 messages=messages,
                 model=model,
                 temperature=temperature,
+                key=cache_key,
+                max_ttl=self.settings.LLM_CACHE_TTL_MAX,
                 tools=tools,
+                max_tokens=max_tokens,
                 **kwargs
             )
             
@@ -172,20 +266,36 @@ class LLMService:
                     message_count=len(messages)
                 )
                 return cached_response
+
+        # Second tier: a cached response to a similarly worded last user message
+        semantic_key = None
+        if use_cache and self.settings.LLM_CACHE_ENABLED and self.settings.SEMANTIC_CACHE_ENABLED:
+            semantic_key = await self._semantic_cache_key(
+                messages, model, tools=tools, temperature=temperature, max_tokens=max_tokens, **kwargs
+            )
+            if semantic_key is not None:
+                match = _get_semantic_cache(self.settings).lookup(*semantic_key)
+                if match is not None:
+                    response, similarity = match
+                    logger.info(
+                        "semantic_cache_hit",
+                        model=model,
+                        similarity=round(similarity, 4),
+                        message_count=len(messages)
+                    )
+                    return response
         
-        # Make actual API call with timeout
+        # Make actual API call; the timeout is enforced by the HTTP client
         try:
-            response = await asyncio.wait_for(
-                self.client.chat_completions(
-                    messages=messages,
-                    model=model,
-                    tools=tools,
-                    stream=False,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    **kwargs
-                ),
-                timeout=self.settings.LLM_REQUEST_TIMEOUT
+            response = await self.client.chat_completions(
+                messages=messages,
+                model=model,
+                tools=tools,
+                stream=False,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=self.settings.LLM_REQUEST_TIMEOUT,
+                **kwargs
             )
             
             # Cache the response
@@ -195,10 +305,14 @@ class LLMService:
                     model=model,
                     response=response,
                     temperature=temperature,
-                    ttl=self.settings.LLM_CACHE_TTL,
+                    ttl=self.settings.LLM_CACHE_TTL_BASE,
+                    key=cache_key,
                     tools=tools,
+                    max_tokens=max_tokens,
                     **kwargs
                 )
+            if semantic_key is not None:
+                _get_semantic_cache(self.settings).store(*semantic_key, response)
             
             logger.info(
                 "llm_call_success",
@@ -228,6 +342,35 @@ class LLMService:
             )
             raise
     
+    async def _semantic_cache_key(
+        self,
+        messages: list[dict],
+        model: str,
+        **params
+    ) -> Optional[tuple[bytes, list[float]]]:
+        """
+        Build the semantic cache scope and query embedding for a request.
+
+        Args:
+            messages: List of message dictionaries
+            model: Model name
+            **params: Other request parameters that must match exactly
+
+        Returns:
+            (scope, embedding), or None if the request does not end with a
+            plain-text user message or the embedding call fails
+        """
+        last = messages[-1] if messages else None
+        if not last or last.get("role") != "user" or not isinstance(last.get("content"), str):
+            return None
+
+        try:
+            embeddings = await self.create_embedding(normalize_query(last["content"]))
+        except Exception as e:
+            logger.warning("semantic_cache_embedding_failed", error=str(e))
+            return None
+        return SemanticCache.make_scope(model, messages[:-1], **params), embeddings[0]
+    
     async def create_embedding(
         self,
         text: Union[str, list[str]],
@@ -247,34 +390,41 @@ class LLMService:
         """
         model = model or self.settings.EMBEDDING_MODEL
         
-        # Generate cache key for embeddings
+        # Cache entries carry a fingerprint of everything that shapes the vectors,
+        # so entries from another model or cache version are never returned
+        fingerprint = f"{model}:v{self.settings.EMBEDDING_CACHE_VERSION}"
         cache_key = None
         if use_cache and self.settings.LLM_CACHE_ENABLED:
-            cache_key = self.cache._generate_key("embedding", text, model)
+            cache_key = self.cache._generate_key("embedding", fingerprint, text)
             cached = await self.cache.get(cache_key)
             
             if cached:
-                import json
-                logger.info("embedding_cache_hit", model=model)
-                return json.loads(cached)
+                embeddings = self._decode_cached_embeddings(cached, fingerprint)
+                if embeddings is not None:
+                    logger.info("embedding_cache_hit", model=model)
+                    return embeddings
+                logger.warning("embedding_cache_entry_rejected", model=model)
         
-        # Create embeddings
+        # Create embeddings: single texts are micro-batched with concurrent
+        # callers, lists are sent in provider-sized chunks. Both paths time
+        # out inside the HTTP client (LLM_REQUEST_TIMEOUT per API call).
         try:
-            response = await asyncio.wait_for(
-                self.client.create_embedding(text, model),
-                timeout=self.settings.LLM_REQUEST_TIMEOUT
-            )
-            
-            # Extract embeddings from response
-            embeddings = [item["embedding"] for item in response["data"]]
+            if isinstance(text, str):
+                embeddings = [await self._get_embedding_batcher(model).embed(text)]
+            else:
+                batch_size = self.settings.EMBEDDING_MAX_BATCH
+                embeddings = []
+                for start in range(0, len(text), batch_size):
+                    embeddings.extend(await _embed_batch(
+                        self.client, text[start:start + batch_size], model, self.settings.LLM_REQUEST_TIMEOUT
+                    ))
             
             # Cache the result
             if use_cache and cache_key and self.settings.LLM_CACHE_ENABLED:
-                import json
                 await self.cache.set(
                     cache_key,
-                    json.dumps(embeddings),
-                    ttl=self.settings.LLM_CACHE_TTL
+                    self._encode_cached_embeddings(embeddings, fingerprint),
+                    ttl=self.settings.LLM_CACHE_TTL_MAX
                 )
             
             logger.info(
@@ -301,6 +451,65 @@ class LLMService:
             )
             raise
     
+    def _encode_cached_embeddings(self, embeddings: list[list[float]], fingerprint: str) -> str:
+        """
+        Encode embeddings for the cache as packed floats.
+
+        Args:
+            embeddings: Embedding vectors
+            fingerprint: Fingerprint of the model/cache version
+
+        Returns:
+            JSON cache entry
+        """
+        dtype = "f4" if self.settings.EMBEDDING_CACHE_PRECISION == "fp32" else "f2"
+        try:
+            data = encode_vectors(embeddings, dtype)
+        except OverflowError:  # values beyond the float16 range
+            dtype = "f4"
+            data = encode_vectors(embeddings, dtype)
+        return json.dumps({
+            "v": fingerprint,
+            "dim": len(embeddings[0]) if embeddings else 0,
+            "t": dtype,
+            "b": data
+        })
+
+    @staticmethod
+    def _decode_cached_embeddings(cached: str, fingerprint: str) -> Optional[list[list[float]]]:
+        """
+        Decode a cached embedding entry, rejecting stale or malformed ones.
+
+        Args:
+            cached: Cached value
+            fingerprint: Fingerprint the entry must have been written with
+
+        Returns:
+            Embedding vectors, or None if the entry cannot be used
+        """
+        try:
+            entry = json.loads(cached)
+            if not isinstance(entry, dict) or entry.get("v") != fingerprint:
+                return None
+            return decode_vectors(entry["b"], entry["dim"], entry["t"])
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            return None
+
+    def _get_embedding_batcher(self, model: str) -> EmbeddingBatcher:
+        """Get the process-wide batcher for an embedding model"""
+        batcher = _embedding_batchers.get(model)
+        if batcher is None:
+            # The client is a process-wide singleton, so binding it here is safe
+            client = self.client
+            timeout = self.settings.LLM_REQUEST_TIMEOUT
+            batcher = EmbeddingBatcher(
+                lambda texts: _embed_batch(client, texts, model, timeout),
+                max_batch=self.settings.EMBEDDING_MAX_BATCH,
+                flush_delay_s=self.settings.EMBEDDING_FLUSH_MS / 1000
+            )
+            _embedding_batchers[model] = batcher
+        return batcher
+
     async def summarize_text(
         self,
         text: str,
@@ -321,13 +530,13 @@ class LLMService:
         model = model or self.settings.OPENAI_MODEL
         
         messages = [
-            {
-                "role": "system",
-                "content": "你是一个擅长总结的助手。请用简洁的中文总结以下内容，保留关键信息。"
-            },
+            {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
             {
                 "role": "user",
-                "content": f"请总结以下内容（不超过{max_length}字）：\n\n{text[:6000]}"
+                "content": _SUMMARY_USER_TEMPLATE.format(
+                    max_length=max_length,
+                    text=text[:self.settings.SUMMARY_INPUT_MAX_CHARS]
+                )
             }
         ]
         
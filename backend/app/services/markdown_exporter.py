@@ -3,10 +3,44 @@
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
 from pathlib import Path
 
+from app.utils.json_utils import json_dumps_pretty
+
+# Bookkeeping for incremental exports, kept next to the exported files
+EXPORT_STATE_FILE = ".export_state.json"
+
+# Every chat file ends with this footer (fixed byte length), which appends replace
+FOOTER_PREFIX = "---\n*生成时间: "
+
+# Chat files are streamed to disk through a buffer of this size
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Exports of one session may overlap (debounced tasks, API calls); appends must not interleave
+_export_lock = threading.Lock()
+
+
+def _pretty_json(value: Any) -> str:
+    """
+    Render a tool argument/result as indented JSON for a code block
+
+    Args:
+        value: Parsed JSON value, or a JSON string
+
+    Returns:
+        Indented JSON, or str(value) if it is not valid JSON
+    """
+    try:
+        if isinstance(value, str):
+            # Stdlib parser: orjson would turn integers wider than 64 bits into floats
+            value = json.loads(value)
+        return json_dumps_pretty(value)
+    except (TypeError, ValueError):
+        return str(value)
+
 
 class MarkdownExporter:
     """Service for exporting conversation history to Markdown files"""
@@ -44,7 +78,8 @@ class MarkdownExporter:
         Returns:
             Formatted timestamp string
         """
-        return dt.strftime("%Y%m%d-%H%M%S")
+        # Same output as strftime("%Y%m%d-%H%M%S") without its locale-aware formatting
+        return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}-{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
 
     def export_system_prompt(
         self,
@@ -64,13 +99,7 @@ class MarkdownExporter:
         conv_dir = self._ensure_directory(session_id)
         file_path = conv_dir / "系统提示词.md"
 
-        content = f"""# 系统提示词
-
-{system_prompt}
-
----
-*生成时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
-"""
+        content = f"# 系统提示词\n\n{system_prompt}\n\n{self._footer(datetime.now())}"
 
         file_path.write_text(content, encoding="utf-8")
         return str(file_path)
@@ -93,38 +122,75 @@ class MarkdownExporter:
         conv_dir = self._ensure_directory(session_id)
         file_path = conv_dir / "聊天记录.md"
 
-        lines = ["# 聊天记录\n"]
+        now = datetime.now()
+        self._write_chat_file(
+            file_path, "# 聊天记录\n", (self._format_simple_message(msg, now) for msg in messages), now
+        )
+        return str(file_path)
 
-        for msg in messages:
-            role = msg.get("role")
-            content = msg.get("content", "")
-            created_at = msg.get("created_at")
+    def _write_chat_file(self, file_path: Path, title: str, blocks: Iterable[str], now: datetime) -> None:
+        """
+        Write a chat file block by block through a large write buffer
 
-            # Only include user and assistant messages
-            if role not in ["user", "assistant"]:
-                continue
+        The Markdown for long histories is never materialized as one string.
 
-            if created_at:
-                if isinstance(created_at, str):
-                    # Parse ISO format datetime
-                    try:
-                        dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    except:
-                        dt = datetime.now()
-                else:
-                    dt = created_at
+        Args:
+            file_path: Chat file to (re)write
+            title: Heading line(s) at the top of the file
+            blocks: Formatted message blocks, in order
+            now: Export time for the footer
+        """
+        with open(file_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(title)
+            for block in blocks:
+                f.write(block)
+            f.write(self._footer(now))
 
-                timestamp = self._format_timestamp(dt)
-            else:
-                timestamp = self._format_timestamp(datetime.now())
+    def _message_timestamp(self, msg: Dict[str, Any], now: datetime) -> str:
+        """
+        Format a message's created_at (datetime or ISO string) for headings
 
-            lines.append(f"---{timestamp}：{role}---\n")
-            lines.append(f"{content}\n\n")
+        Args:
+            msg: Message dictionary
+            now: Export time, used when the message has no usable timestamp
+
+        Returns:
+            Formatted timestamp string
+        """
+        created_at = msg.get("created_at")
+        if isinstance(created_at, str):
+            # fromisoformat accepts a trailing "Z" since Python 3.11
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except ValueError:
+                created_at = None
+        return self._format_timestamp(created_at or now)
+
+    def _footer(self, now: datetime) -> str:
+        """Footer appended to every chat file"""
+        return (
+            f"{FOOTER_PREFIX}{now.year:04d}-{now.month:02d}-{now.day:02d} "
+            f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}*\n"
+        )
+
+    def _format_simple_message(self, msg: Dict[str, Any], now: datetime) -> str:
+        """
+        Format one message for the simple chat file
+
+        Args:
+            msg: Message dictionary
+            now: Export time (fallback timestamp)
 
-        lines.append(f"---\n*生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+        Returns:
+            Markdown block (empty for anything but user and assistant messages)
+        """
+        role = msg.get("role")
 
-        file_path.write_text("".join(lines), encoding="utf-8")
-        return str(file_path)
+        # Only include user and assistant messages
+        if role not in ["user", "assistant"]:
+            return ""
+
+        return f"---{self._message_timestamp(msg, now)}：{role}---\n{msg.get('content', '')}\n\n"
 
     def export_full_chat(
         self,
@@ -144,101 +210,79 @@ class MarkdownExporter:
         conv_dir = self._ensure_directory(session_id)
         file_path = conv_dir / "完整聊天记录.md"
 
-        lines = ["# 完整聊天记录（含工具调用）\n"]
-
-        for msg in messages:
-            role = msg.get("role")
-            content = msg.get("content", "")
-            tool_calls = msg.get("tool_calls")
-            tool_call_results = msg.get("tool_call_results")
-            created_at = msg.get("created_at")
-            metadata = msg.get("metadata", {})
-
-            if created_at:
-                if isinstance(created_at, str):
-                    try:
-                        dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    except:
-                        dt = datetime.now()
-                else:
-                    dt = created_at
-
-                timestamp = self._format_timestamp(dt)
-            else:
-                timestamp = self._format_timestamp(datetime.now())
-
-            # Handle different message types
-            if role == "user":
-                lines.append(f"---{timestamp}：user---\n")
-                lines.append(f"{content}\n\n")
-
-            elif role == "assistant":
-                lines.append(f"---{timestamp}：assistant---\n")
-                lines.append(f"{content}\n\n")
-
-                # If this assistant message has tool calls, add them
-                if tool_calls:
-                    tool_timestamp = metadata.get("tool_call_timestamp", timestamp)
-                    lines.append(f"---{tool_timestamp}：tool---\n")
-                    lines.append("**工具调用:**\n\n")
-
-                    for i, tool_call in enumerate(tool_calls):
-                        if isinstance(tool_call, dict):
-                            tool_name = tool_call.get("function", {}).get("name", "unknown")
-                            tool_args = tool_call.get("function", {}).get("arguments", "{}")
-
-                            lines.append(f"**调用 #{i+1}: {tool_name}**\n\n")
-                            lines.append("入参:\n```json\n")
-
-                            # Pretty print JSON
-                            try:
-                                if isinstance(tool_args, str):
-                                    args_obj = json.loads(tool_args)
-                                else:
-                                    args_obj = tool_args
-                                lines.append(json.dumps(args_obj, indent=2, ensure_ascii=False))
-                            except:
-                                lines.append(str(tool_args))
+        now = datetime.now()
+        self._write_chat_file(
+            file_path,
+            "# 完整聊天记录（含工具调用）\n",
+            (self._format_full_message(msg, now) for msg in messages),
+            now
+        )
+        return str(file_path)
+
+    def _format_full_message(self, msg: Dict[str, Any], now: datetime) -> str:
+        """
+        Format one message, including tool calls and results, for the full chat file
+
+        Args:
+            msg: Message dictionary
+            now: Export time (fallback timestamp)
+
+        Returns:
+            Markdown block
+        """
+        role = msg.get("role")
+        content = msg.get("content", "")
+        tool_calls = msg.get("tool_calls")
+        tool_call_results = msg.get("tool_call_results")
+        metadata = msg.get("metadata") or {}
+        timestamp = self._message_timestamp(msg, now)
+        lines: List[str] = []
+
+        # Handle different message types
+        if role == "user":
+            lines.append(f"---{timestamp}：user---\n")
+            lines.append(f"{content}\n\n")
+
+        elif role == "assistant":
+            lines.append(f"---{timestamp}：assistant---\n")
+            lines.append(f"{content}\n\n")
 
+            # If this assistant message has tool calls, add them
+            if tool_calls:
+                tool_timestamp = metadata.get("tool_call_timestamp", timestamp)
+                lines.append(f"---{tool_timestamp}：tool---\n")
+                lines.append("**工具调用:**\n\n")
+
+                for i, tool_call in enumerate(tool_calls):
+                    if isinstance(tool_call, dict):
+                        tool_name = tool_call.get("function", {}).get("name", "unknown")
+                        tool_args = tool_call.get("function", {}).get("arguments", "{}")
+
+                        lines.append(f"**调用 #{i+1}: {tool_name}**\n\n")
+                        lines.append("入参:\n```json\n")
+                        lines.append(_pretty_json(tool_args))
+                        lines.append("\n```\n\n")
+
+                        # Add tool result if available
+                        if tool_call_results and i < len(tool_call_results):
+                            result = tool_call_results[i]
+                            lines.append("出参:\n```json\n")
+                            lines.append(_pretty_json(result))
                             lines.append("\n```\n\n")
 
-                            # Add tool result if available
-                            if tool_call_results and i < len(tool_call_results):
-                                result = tool_call_results[i]
-                                lines.append("出参:\n```json\n")
-                                try:
-                                    if isinstance(result, str):
-                                        result_obj = json.loads(result)
-                                    else:
-                                        result_obj = result
-                                    lines.append(json.dumps(result_obj, indent=2, ensure_ascii=False))
-                                except:
-                                    lines.append(str(result))
-                                lines.append("\n```\n\n")
-
-            elif role == "tool":
-                # Tool result message (if stored separately)
-                lines.append(f"---{timestamp}：tool---\n")
-                lines.append("**工具返回结果:**\n\n")
-                lines.append("```json\n")
-                try:
-                    if isinstance(content, str):
-                        content_obj = json.loads(content)
-                    else:
-                        content_obj = content
-                    lines.append(json.dumps(content_obj, indent=2, ensure_ascii=False))
-                except:
-                    lines.append(str(content))
-                lines.append("\n```\n\n")
-
-            elif role == "system":
-                lines.append(f"---{timestamp}：system---\n")
-                lines.append(f"{content}\n\n")
-
-        lines.append(f"---\n*生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
-
-        file_path.write_text("".join(lines), encoding="utf-8")
-        return str(file_path)
+        elif role == "tool":
+            # Tool result message (if stored separately)
+            lines.append(f"---{timestamp}：tool---\n")
+            lines.append("**工具返回结果:**\n\n")
+            lines.append("```json\n")
+            lines.append(_pretty_json(content))
+            lines.append("\n```\n\n")
+
+        elif role == "system":
+            lines.append(f"---{timestamp}：system---\n")
+            lines.append(f"{content}\n\n")
+
+        return "".join(lines)
 
     def export_all(
         self,
@@ -257,8 +301,163 @@ class MarkdownExporter:
         Returns:
             Dictionary with file paths for each export type
         """
-        return {
-            "system_prompt": self.export_system_prompt(session_id, system_prompt),
-            "simple_chat": self.export_simple_chat(session_id, messages),
-            "full_chat": self.export_full_chat(session_id, messages)
-        }
+        with _export_lock:
+            result = {
+                "system_prompt": self.export_system_prompt(session_id, system_prompt),
+                "simple_chat": self.export_simple_chat(session_id, messages),
+                "full_chat": self.export_full_chat(session_id, messages)
+            }
+            self._write_export_state(session_id, messages[-1] if messages else None, len(messages))
+            return result
+
+    def read_export_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read where the last export of a session stopped
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Dict with "last_message_id", "last_message_at" (ISO string) and
+            "message_count" (messages in the chat files), or None if the
+            session has no usable export yet
+        """
+        state_path = self.base_path / session_id / "conversations" / EXPORT_STATE_FILE
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (
+            not state.get("last_message_id")
+            or not state.get("last_message_at")
+            or not isinstance(state.get("message_count"), int)
+        ):
+            return None
+        return state
+
+    def _write_export_state(
+        self,
+        session_id: str,
+        last_message: Optional[Dict[str, Any]],
+        message_count: int
+    ) -> None:
+        """
+        Record the last exported message, or clear the state if there is none
+
+        Args:
+            session_id: Session ID
+            last_message: Last message written to the chat files
+            message_count: Number of messages now in the chat files
+        """
+        state_path = self._ensure_directory(session_id) / EXPORT_STATE_FILE
+        created_at = last_message.get("created_at") if last_message else None
+        if not last_message or not created_at:
+            state_path.unlink(missing_ok=True)
+            return
+        if isinstance(created_at, datetime):
+            created_at = created_at.isoformat()
+        state_path.write_text(
+            json.dumps({
+                "last_message_id": last_message["id"],
+                "last_message_at": created_at,
+                "message_count": message_count
+            }),
+            encoding="utf-8"
+        )
+
+    def _append_to_chat_file(self, file_path: Path, blocks: str, now: datetime) -> bool:
+        """
+        Replace a chat file's footer with new message blocks and a fresh footer
+
+        Args:
+            file_path: Exported chat file
+            blocks: Formatted Markdown for the new messages
+            now: Export time for the new footer
+
+        Returns:
+            False if the file is missing or does not end with a footer
+        """
+        footer = self._footer(now).encode("utf-8")
+        # Every footer has the same byte length, so this also sizes the old one
+        footer_size = len(footer)
+        try:
+            with open(file_path, "r+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size < footer_size:
+                    return False
+                f.seek(size - footer_size)
+                if not f.read(footer_size).startswith(FOOTER_PREFIX.encode("utf-8")):
+                    return False
+                f.seek(size - footer_size)
+                f.truncate()
+                f.write(blocks.encode("utf-8") + footer)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def append_messages(
+        self,
+        session_id: str,
+        system_prompt: str,
+        messages: List[Dict[str, Any]],
+        after_message_id: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Append messages newer than the last export to the chat files
+
+        Only the new messages are formatted and written; the system prompt
+        file is small and is simply rewritten. With no new messages nothing
+        is written at all.
+
+        Args:
+            session_id: Session ID
+            system_prompt: System prompt content
+            messages: Messages created after ``after_message_id``, in order
+            after_message_id: Last exported message the caller read the state at
+
+        Returns:
+            Dictionary with file paths for each export type, or None if the
+            existing files cannot be appended to (callers should export_all)
+        """
+        with _export_lock:
+            state = self.read_export_state(session_id)
+            if state is None:
+                return None
+            if state["last_message_id"] != after_message_id:
+                # An overlapping export got further; keep only what it has not written
+                ids = [msg["id"] for msg in messages]
+                if state["last_message_id"] not in ids:
+                    return None
+                messages = messages[ids.index(state["last_message_id"]) + 1:]
+
+            conv_dir = self._ensure_directory(session_id)
+            prompt_path = conv_dir / "系统提示词.md"
+            simple_path = conv_dir / "聊天记录.md"
+            full_path = conv_dir / "完整聊天记录.md"
+            if not messages:
+                # Nothing new since the last export: leave the files untouched
+                if not (simple_path.exists() and full_path.exists()):
+                    return None
+                if not prompt_path.exists():
+                    self.export_system_prompt(session_id, system_prompt)
+                return {
+                    "system_prompt": str(prompt_path),
+                    "simple_chat": str(simple_path),
+                    "full_chat": str(full_path)
+                }
+
+            now = datetime.now()
+            simple_blocks = "".join(self._format_simple_message(msg, now) for msg in messages)
+            full_blocks = "".join(self._format_full_message(msg, now) for msg in messages)
+            if not (
+                self._append_to_chat_file(simple_path, simple_blocks, now)
+                and self._append_to_chat_file(full_path, full_blocks, now)
+            ):
+                return None
+            self._write_export_state(session_id, messages[-1], state["message_count"] + len(messages))
+
+            return {
+                "system_prompt": self.export_system_prompt(session_id, system_prompt),
+                "simple_chat": str(simple_path),
+                "full_chat": str(full_path)
+            }
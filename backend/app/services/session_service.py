@@ -338,6 +338,45 @@ class SessionService:
             "created_at": int(message.created_at.timestamp() * 1000),
         }
     
+    async def add_messages(
+        self,
+        session_id: str,
+        messages: List[dict]
+    ) -> List[dict]:
+        """
+        Add several messages to a session in one write and one commit.
+
+        Args:
+            session_id: Session ID
+            messages: Message dicts with role, content and optional
+                tool_calls, tool_call_results, metadata and created_at
+
+        Returns:
+            List of message dictionaries, in the given order
+        """
+        rows = await self.message_repo.create_many(
+            session_id=session_id,
+            messages=[
+                {**msg, "message_id": str(uuid.uuid4())}
+                for msg in messages
+            ]
+        )
+        # 同上：尽早提交，避免长时间持有事务/锁
+        await self.db.commit()
+
+        return [
+            {
+                "id": message.id,
+                "role": message.role,
+                "content": message.content,
+                "tool_calls": message.tool_calls or [],
+                "tool_call_results": message.tool_call_results,
+                "metadata": message.message_metadata,
+                "created_at": int(message.created_at.timestamp() * 1000),
+            }
+            for message in rows
+        ]
+    
     async def get_recent_messages(
         self,
         session_id: str,
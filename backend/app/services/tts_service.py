@@ -3,11 +3,17 @@ TTS 服务层
 提供智能分段和文本处理功能
 """
 import re
-from typing import List, Generator
+from collections import deque
+from typing import Deque, List, Generator
 
 
 class TextSegmenter:
-    """文本智能分段器"""
+    """
+    文本智能分段器
+
+    流式片段先追加到 deque 中，只有累计长度达到 min_length 时才拼接成缓冲区并扫描，
+    且每次只扫描上次未找到分段点之后新增的部分，整体扫描开销为 O(N)。
+    """
 
     # 句子结束标点（中英文）
     SENTENCE_ENDINGS = r'[。！？；.!?;]'
@@ -15,6 +21,9 @@ class TextSegmenter:
     # 次要分隔符（用于长句拆分）
     SECONDARY_DELIMITERS = r'[，、,]'
 
+    _SENTENCE_ENDINGS_RE = re.compile(SENTENCE_ENDINGS)
+    _SECONDARY_DELIMITERS_RE = re.compile(SECONDARY_DELIMITERS)
+
     def __init__(
         self,
         min_length: int = 10,
@@ -32,7 +41,31 @@ class TextSegmenter:
         self.min_length = min_length
         self.max_length = max_length
         self.prefer_length = prefer_length
-        self.buffer = ""
+        self._buffer = ""
+        # 尚未拼接进缓冲区的文本片段
+        self._pending: Deque[str] = deque()
+        self._pending_length = 0
+        # 缓冲区中此位置之前已确认没有可用的分段点
+        self._scan_from = 0
+
+    @property
+    def buffer(self) -> str:
+        """当前缓冲区内容（包含尚未拼接的片段）"""
+        self._merge_pending()
+        return self._buffer
+
+    def _merge_pending(self) -> None:
+        """将待拼接的片段一次性合并到缓冲区"""
+        if self._pending:
+            self._pending.appendleft(self._buffer)
+            self._buffer = "".join(self._pending)
+            self._pending.clear()
+            self._pending_length = 0
+
+    def _set_buffer(self, text: str) -> None:
+        """替换缓冲区内容并重置扫描位置"""
+        self._buffer = text
+        self._scan_from = 0
 
     def add_text(self, text: str) -> List[str]:
         """
@@ -44,7 +77,16 @@ class TextSegmenter:
         Returns:
             可以发送的段落列表
         """
-        self.buffer += text
+        if text:
+            self._pending.append(text)
+            self._pending_length += len(text)
+
+        # 快速路径：长度不足时无需拼接和扫描
+        total_length = len(self._buffer) + self._pending_length
+        if total_length < self.min_length and total_length <= self.max_length:
+            return []
+
+        self._merge_pending()
         segments = []
 
         while True:
@@ -62,15 +104,15 @@ class TextSegmenter:
         Returns:
             提取的段落，如果没有可提取的段落则返回 None
         """
-        if not self.buffer:
+        if not self._buffer:
             return None
 
         # 如果缓冲区过长，强制分段
-        if len(self.buffer) > self.max_length:
+        if len(self._buffer) > self.max_length:
             return self._force_split()
 
         # 如果缓冲区过短，等待更多文本
-        if len(self.buffer) < self.min_length:
+        if len(self._buffer) < self.min_length:
             return None
 
         # 查找合适的分段点
@@ -88,32 +130,31 @@ class TextSegmenter:
         Returns:
             分段的文本，如果没有找到则返回 None
         """
-        # 优先查找句子结束标点
-        matches = list(re.finditer(self.SENTENCE_ENDINGS, self.buffer))
-
-        if not matches:
-            return None
-
-        # 寻找最接近偏好长度的分段点
-        best_match = None
+        # 寻找最接近偏好长度的分段点（只扫描新增部分）
+        best_pos = None
         best_distance = float('inf')
 
-        for match in matches:
+        for match in self._SENTENCE_ENDINGS_RE.finditer(self._buffer, self._scan_from):
             pos = match.end()
             distance = abs(pos - self.prefer_length)
 
             # 必须满足最小长度要求
-            if pos >= self.min_length and distance < best_distance:
-                best_match = match
-                best_distance = distance
-
-        if best_match:
-            pos = best_match.end()
-            segment = self.buffer[:pos].strip()
-            self.buffer = self.buffer[pos:].strip()
-            return segment
+            if pos >= self.min_length:
+                if distance < best_distance:
+                    best_pos = pos
+                    best_distance = distance
+                # 位置递增：越过偏好长度后距离只会变大，后续标点无需再看
+                if pos >= self.prefer_length:
+                    break
+
+        if best_pos is None:
+            # 已扫描部分的标点位置固定，之后无需重复扫描
+            self._scan_from = len(self._buffer)
+            return None
 
-        return None
+        segment = self._buffer[:best_pos].strip()
+        self._set_buffer(self._buffer[best_pos:].strip())
+        return segment
 
     def _force_split(self) -> str:
         """
@@ -122,18 +163,17 @@ class TextSegmenter:
         Returns:
             分段的文本
         """
-        # 尝试在次要分隔符处分段
-        matches = list(re.finditer(self.SECONDARY_DELIMITERS, self.buffer[:self.max_length]))
+        # 尝试在次要分隔符处分段，取最后一个次要分隔符
+        pos = None
+        for match in self._SECONDARY_DELIMITERS_RE.finditer(self._buffer, 0, self.max_length):
+            pos = match.end()
 
-        if matches:
-            # 取最后一个次要分隔符
-            pos = matches[-1].end()
-        else:
+        if pos is None:
             # 没有次要分隔符，直接截断
             pos = self.max_length
 
-        segment = self.buffer[:pos].strip()
-        self.buffer = self.buffer[pos:].strip()
+        segment = self._buffer[:pos].strip()
+        self._set_buffer(self._buffer[pos:].strip())
         return segment
 
     def flush(self) -> str | None:
@@ -143,11 +183,12 @@ class TextSegmenter:
         Returns:
             剩余的文本，如果缓冲区为空则返回 None
         """
-        if not self.buffer:
+        self._merge_pending()
+        if not self._buffer:
             return None
 
-        segment = self.buffer.strip()
-        self.buffer = ""
+        segment = self._buffer.strip()
+        self._set_buffer("")
         return segment
 
 
@@ -67,19 +67,11 @@ class UserService:
         Returns:
             List of allowed paths
         """
-        # Try cache first
-        cached_paths = await self.cache.get_user_paths(user_id)
-        if cached_paths is not None:
-            logger.debug("user_paths_cache_hit", user_id=user_id)
-            return cached_paths
-        
-        # Load from database
-        paths = await self.path_repo.list_by_user(user_id)
-        
-        # Cache the result
-        await self.cache.set_user_paths(user_id, paths, ttl=3600)
-        
-        return paths
+        return await self.cache.get_or_set(
+            self.cache.user_paths_cache_key(user_id),
+            lambda: self.path_repo.list_by_user(user_id),
+            ttl=3600
+        )
     
     async def set_user_paths(
         self,
@@ -0,0 +1,27 @@
+# File: backend/app/utils/clock.py
+# Purpose: Cheap ISO 8601 wall-clock timestamps with a cached per-second prefix
+import time
+from datetime import datetime, timezone
+
+# Last formatted second; a single tuple so readers never see a torn update
+_cached_second: tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as a naive ISO 8601 string with microseconds.
+
+    The date/time prefix is formatted at most once per second; each call
+    only formats the microsecond tail, so hot paths skip building a
+    datetime and calling isoformat().
+
+    Returns:
+        Timestamp such as "2024-01-01T12:00:00.123456"
+    """
+    global _cached_second
+    second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached, prefix = _cached_second
+    if cached != second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+        _cached_second = (second, prefix)
+    return f"{prefix}.{micros:06d}"
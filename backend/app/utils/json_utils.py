@@ -0,0 +1,97 @@
+# File: backend/app/utils/json_utils.py
+# Purpose: Fast JSON serialization with orjson, falling back to the stdlib json module
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize an object to a compact JSON string, keeping non-ASCII text as-is.
+
+    Uses orjson when installed; values orjson rejects (e.g. integers wider
+    than 64 bits) are handled by the stdlib encoder.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def json_dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes.
+
+    Same encoding rules as json_dumps, but orjson's bytes output is returned
+    directly, without a decode/encode round trip.
+
+    Args:
+        obj: JSON-serializable object
+        default: Fallback for objects the encoder does not support
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def json_dumps_pretty(obj: Any) -> str:
+    """
+    Serialize an object to JSON indented by two spaces, keeping non-ASCII text as-is.
+
+    The stdlib encoder has no C fast path for indented output, so orjson
+    is considerably faster here.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Indented JSON string
+
+    Raises:
+        TypeError: If obj is not JSON-serializable
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text, using orjson when installed.
+
+    orjson reads integers wider than 64 bits as floats, so use this only
+    for payloads where that cannot matter (e.g. LLM API stream chunks).
+
+    Args:
+        data: JSON document as str or UTF-8 bytes
+
+    Returns:
+        Parsed value
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,90 @@
+# File: backend/app/utils/sse.py
+# Purpose: Server-Sent Events frame encoding and write coalescing
+import asyncio
+import contextvars
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.utils.json_utils import json_dumps_bytes
+
+SSE_PING = b": ping\n\n"
+
+
+def sse_event(event: str, data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Encode one SSE frame, JSON-encoding the payload straight to bytes"""
+    return b"".join((
+        b"event: ", event.encode("ascii"),
+        b"\ndata: ", json_dumps_bytes(data, default=default),
+        b"\n\n"
+    ))
+
+
+async def coalesce_frames(
+    frames: AsyncIterator[bytes],
+    max_bytes: int = 4096,
+    max_delay_s: float = 0.005
+) -> AsyncIterator[bytes]:
+    """
+    Merge consecutive SSE frames into larger writes.
+
+    Frames are buffered until ``max_bytes`` is reached or the oldest buffered
+    frame has waited ``max_delay_s``; the buffer is also flushed when the
+    source goes quiet (e.g. during a tool call), so latency stays bounded.
+
+    The source is advanced in tasks that all share one context, so context
+    variables it sets (such as the runtime allowed roots) persist between
+    frames exactly as if it were iterated directly.
+
+    Args:
+        frames: Encoded SSE frames
+        max_bytes: Flush once this many bytes are buffered
+        max_delay_s: Maximum time a frame may wait in the buffer
+
+    Yields:
+        One or more concatenated frames
+    """
+    if max_delay_s <= 0:
+        async for frame in frames:
+            yield frame
+        return
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    source = frames.__aiter__()
+    buffer = bytearray()
+    deadline = 0.0
+    pending: Optional[asyncio.Task] = None
+    try:
+        while True:
+            if pending is None:
+                pending = loop.create_task(source.__anext__(), context=context)
+
+            if buffer and not pending.done():
+                # Wait for the next frame only until the buffered ones are due
+                await asyncio.wait({pending}, timeout=max(0.0, deadline - loop.time()))
+                if not pending.done():
+                    yield bytes(buffer)
+                    buffer.clear()
+                    continue
+
+            try:
+                frame = await pending
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+
+            if not buffer:
+                deadline = loop.time() + max_delay_s
+            buffer += frame
+            if len(buffer) >= max_bytes or loop.time() >= deadline:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+        else:
+            # Close the source in its own context so its cleanup sees its context variables
+            await loop.create_task(source.aclose(), context=context)
@@ -0,0 +1,25 @@
+# File: backend/tests/unit/test_buffers.py
+# Purpose: Validate BufferPool reuse, size limits and capacity.
+from app.core.buffers import BufferPool
+
+
+def test_reuses_released_buffer():
+    pool = BufferPool()
+    with pool.acquire(4096) as first:
+        pass
+    with pool.acquire(2048) as second:
+        assert second is first
+
+
+def test_small_buffers_are_not_pooled():
+    pool = BufferPool()
+    with pool.acquire(100) as buf:
+        assert len(buf) >= 100
+    assert len(pool) == 0
+
+
+def test_pool_size_is_capped():
+    pool = BufferPool(max_buffers=2)
+    with pool.acquire(2048), pool.acquire(2048), pool.acquire(2048):
+        pass
+    assert len(pool) == 2
@@ -0,0 +1,112 @@
+# File: backend/tests/unit/test_cache_manager.py
+# Purpose: Validate get_or_set and the shared, bounded in-memory fallback store.
+import asyncio
+from collections import OrderedDict
+
+from app.infrastructure.cache import cache_manager
+from app.infrastructure.cache.cache_manager import CacheManager
+
+
+def test_get_or_set_loads_once_and_is_shared_across_managers():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return ["/tmp/a", "路径"]
+
+    async def run():
+        first = await CacheManager(None).get_or_set("test:get_or_set", loader, ttl=60)
+        # A new manager (one is built per request) still sees the cached value
+        second = await CacheManager(None).get_or_set("test:get_or_set", loader, ttl=60)
+        await CacheManager(None).delete("test:get_or_set")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == ["/tmp/a", "路径"]
+    assert len(calls) == 1
+
+
+def test_get_or_set_does_not_cache_none():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return None
+
+    async def run():
+        manager = CacheManager(None)
+        await manager.get_or_set("test:none", loader)
+        await manager.get_or_set("test:none", loader)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_llm_response_accepts_precomputed_key():
+    messages = [{"role": "user", "content": "你好"}]
+
+    async def run():
+        manager = CacheManager(None)
+        key = manager.llm_cache_key(messages, "m", 0.2, max_tokens=16)
+        await manager.set_llm_response(messages, "m", {"ok": True}, 0.2, key=key)
+        hit = await manager.get_llm_response(messages, "m", 0.2, max_tokens=16)
+        other = await manager.get_llm_response(messages, "m", 0.2, max_tokens=32)
+        await manager.delete(key)
+        return hit, other
+
+    hit, other = asyncio.run(run())
+    assert hit == {"ok": True}
+    assert other is None
+
+
+def test_llm_response_hit_extends_ttl_up_to_max():
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def run():
+        manager = CacheManager(None)
+        await manager.set_llm_response(messages, "m", {"ok": True}, ttl=100)
+        key = manager.llm_cache_key(messages, "m")
+        ttls = [await manager.ttl(key)]
+        for _ in range(3):
+            await manager.get_llm_response(messages, "m", max_ttl=300)
+            ttls.append(await manager.ttl(key))
+        await manager.delete(key)
+        return ttls, await manager.ttl(key)
+
+    ttls, missing = asyncio.run(run())
+    assert ttls[0] in (99, 100)
+    assert 198 <= ttls[1] <= 200
+    assert ttls[2] == ttls[3] == 300
+    assert missing == -2
+
+
+def test_memory_store_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(cache_manager, "_memory_store", OrderedDict())
+    monkeypatch.setattr(cache_manager, "MEMORY_STORE_MAX_ENTRIES", 3)
+
+    async def run():
+        manager = CacheManager(None)
+        for key in ("a", "b", "c"):
+            await manager.set(key, key.upper(), ttl=60)
+        await manager.get("a")  # "b" is now the least recently used
+        await manager.set("d", "D", ttl=60)
+        return [await manager.get(key) for key in ("a", "b", "c", "d")]
+
+    assert asyncio.run(run()) == ["A", None, "C", "D"]
+    assert len(cache_manager._memory_store) == 3
+
+
+def test_memory_store_drops_expired_entries_on_write(monkeypatch):
+    monkeypatch.setattr(cache_manager, "_memory_store", OrderedDict())
+    clock = [1000.0]
+
+    async def run():
+        manager = CacheManager(None)
+        monkeypatch.setattr(manager, "_now", lambda: clock[0])
+        await manager.set("old", "x", ttl=10)
+        await manager.set("kept", "y")
+        clock[0] += 11
+        await manager.set("new", "z", ttl=10)
+
+    asyncio.run(run())
+    assert list(cache_manager._memory_store) == ["kept", "new"]
@@ -0,0 +1,76 @@
+# File: backend/tests/unit/test_chat_service.py
+# Purpose: Validate that a chat turn keeps the user message when the client disconnects.
+import asyncio
+from types import SimpleNamespace
+
+from app.services import chat_service
+from app.services.chat_service import ChatService
+
+
+class _FakeSessions:
+    def __init__(self):
+        self.saved = []
+
+    async def add_messages(self, session_id, messages):
+        self.saved.append((session_id, [msg["role"] for msg in messages]))
+
+
+class _EndlessOrchestrator:
+    def __init__(self, **kwargs):
+        pass
+
+    async def run_stream(self, **kwargs):
+        while True:
+            yield {"type": "content", "content": "流" * 40}
+            await asyncio.sleep(0)
+
+
+def _service(monkeypatch):
+    monkeypatch.setattr(chat_service, "AgentOrchestrator", _EndlessOrchestrator)
+    service = ChatService.__new__(ChatService)
+    service.sessions = _FakeSessions()
+    service.llm = SimpleNamespace(client=None)
+    service.settings = SimpleNamespace(
+        OPENAI_MODEL="m",
+        CHAT_RESPONSE_CACHE_ENABLED=False,
+        is_model_allowed=lambda model: True
+    )
+
+    async def begin_turn(user_id, session_id, message, attachments):
+        return {"messages": []}, "", [], "", "prompt"
+
+    service._begin_turn = begin_turn
+    return service
+
+
+def test_user_message_saved_when_stream_is_closed_mid_turn(monkeypatch):
+    service = _service(monkeypatch)
+
+    async def run():
+        events = service.process_chat_message_with_tools("u1", "s1", "你好", tool_registry=None)
+        first = await events.__anext__()
+        await events.aclose()
+        return first
+
+    first = asyncio.run(run())
+    assert first["type"] == "content"
+    assert service.sessions.saved == [("s1", ["user"])]
+
+
+def test_user_message_saved_when_turn_task_is_cancelled(monkeypatch):
+    service = _service(monkeypatch)
+
+    async def consume(started):
+        async for _ in service.process_chat_message_with_tools("u1", "s1", "你好", tool_registry=None):
+            started.set()
+
+    async def run():
+        started = asyncio.Event()
+        task = asyncio.create_task(consume(started))
+        await started.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)  # let the shielded save finish
+
+    asyncio.run(run())
+    assert service.sessions.saved == [("s1", ["user"])]
@@ -0,0 +1,27 @@
+# File: backend/tests/unit/test_clock.py
+# Purpose: Validate the cached ISO clock.
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.utils import clock
+
+
+def _freeze(monkeypatch, now_ns):
+    monkeypatch.setattr(clock, "time", SimpleNamespace(time_ns=lambda: now_ns[0]))
+
+
+def test_now_iso_matches_isoformat(monkeypatch):
+    now_ns = [1_700_000_000_750_001_999]
+    _freeze(monkeypatch, now_ns)
+    assert clock.now_iso() == "2023-11-14T22:13:20.750001"
+    assert datetime.fromisoformat(clock.now_iso()).microsecond == 750001
+
+
+def test_now_iso_keeps_zero_micros_and_rolls_over(monkeypatch):
+    now_ns = [1_700_000_000_000_000_000]
+    _freeze(monkeypatch, now_ns)
+    assert clock.now_iso() == "2023-11-14T22:13:20.000000"
+    now_ns[0] = 1_700_000_000_999_999_000
+    assert clock.now_iso() == "2023-11-14T22:13:20.999999"
+    now_ns[0] = 1_700_000_001_000_001_000
+    assert clock.now_iso() == "2023-11-14T22:13:21.000001"
@@ -0,0 +1,50 @@
+# File: backend/tests/unit/test_conversation_history_service.py
+# Purpose: Validate incremental Markdown export against late-saved messages.
+import asyncio
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.infrastructure.database.models import Base, Message, Session as DBSession, User
+from app.services.conversation_history_service import ConversationHistoryService
+
+
+def _message(index, role, minute):
+    return Message(
+        id=f"m{index}",
+        session_id="s1",
+        role=role,
+        content=f"消息 {index}",
+        created_at=datetime(2026, 1, 1, 0, minute),
+    )
+
+
+def test_message_saved_late_with_earlier_timestamp_is_exported(tmp_path):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_maker() as db:
+            db.add(User(id="u1"))
+            db.add(DBSession(id="s1", user_id="u1", title="t"))
+            db.add_all([_message(1, "user", 1), _message(2, "assistant", 2)])
+            await db.commit()
+
+            history = ConversationHistoryService(db, base_path=str(tmp_path))
+            await history.export_session_to_markdown("s1", "prompt")
+
+            # A slower overlapping turn saves its user message after the export,
+            # stamped with its (earlier) arrival time, followed by a newer reply
+            db.add_all([_message(3, "user", 0), _message(4, "assistant", 3)])
+            await db.commit()
+            result = await history.export_session_to_markdown("s1", "prompt")
+        await engine.dispose()
+        return result
+
+    result = asyncio.run(run())
+    with open(result["simple_chat"], encoding="utf-8") as f:
+        text = f.read()
+    for index in range(1, 5):
+        assert text.count(f"消息 {index}") == 1
+    assert text.index("消息 3") < text.index("消息 1")
@@ -0,0 +1,87 @@
+# File: backend/tests/unit/test_embedding_batcher.py
+# Purpose: Validate embedding request coalescing, dedup and error propagation.
+import asyncio
+
+import pytest
+
+from app.infrastructure.llm.embedding_batcher import EmbeddingBatcher
+
+
+def test_concurrent_texts_share_one_deduplicated_call():
+    calls = []
+
+    async def fetch(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    async def run():
+        batcher = EmbeddingBatcher(fetch, max_batch=8, flush_delay_s=0.01)
+        return await asyncio.gather(*(batcher.embed(t) for t in ["a", "bb", "a", "ccc"]))
+
+    assert asyncio.run(run()) == [[1.0], [2.0], [1.0], [3.0]]
+    assert calls == [["a", "bb", "ccc"]]
+
+
+def test_full_batch_flushes_immediately():
+    calls = []
+
+    async def fetch(texts):
+        calls.append(list(texts))
+        return [[0.0] for _ in texts]
+
+    async def run():
+        batcher = EmbeddingBatcher(fetch, max_batch=2, flush_delay_s=60)
+        await asyncio.wait_for(asyncio.gather(batcher.embed("x"), batcher.embed("y")), timeout=1)
+
+    asyncio.run(run())
+    assert calls == [["x", "y"]]
+
+
+def test_errors_reach_every_waiter():
+    async def fetch(texts):
+        raise RuntimeError("provider down")
+
+    async def run():
+        batcher = EmbeddingBatcher(fetch, flush_delay_s=0)
+        return await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_mismatched_vector_count_is_an_error():
+    async def fetch(texts):
+        return []
+
+    async def run():
+        await EmbeddingBatcher(fetch, flush_delay_s=0).embed("a")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_text_already_in_flight_joins_the_running_call():
+    calls = []
+    release = None
+
+    async def fetch(texts):
+        calls.append(list(texts))
+        await release.wait()
+        return [[1.0] for _ in texts]
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        batcher = EmbeddingBatcher(fetch, max_batch=8, flush_delay_s=0.001)
+        first = asyncio.ensure_future(batcher.embed("a"))
+        await asyncio.sleep(0.01)  # first batch has been sent
+        second = asyncio.ensure_future(batcher.embed("a"))
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(first, second)
+        return results, batcher._inflight
+
+    results, inflight = asyncio.run(run())
+    assert results == [[1.0], [1.0]]
+    assert calls == [["a"]]
+    assert inflight == {}
@@ -0,0 +1,149 @@
+# File: backend/tests/unit/test_file_service.py
+# Purpose: Validate attachment text extraction caching.
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.file_service import BLOB_DIR_NAME, FileService, prune_unreferenced_blobs
+
+
+def _service(tmp_path):
+    settings = SimpleNamespace(
+        UPLOAD_DIR=str(tmp_path / "uploads"),
+        MAX_UPLOAD_SIZE=1024 * 1024,
+        ATTACHMENT_TEXT_LIMIT=10000,
+    )
+    return FileService(settings)
+
+
+def test_extract_text_is_cached_until_file_changes(tmp_path, monkeypatch):
+    service = _service(tmp_path)
+    path = tmp_path / "notes.txt"
+    path.write_text("第一版", encoding="utf-8")
+
+    calls = []
+    original = service._extract_text_uncached
+
+    def counting(file_path):
+        calls.append(file_path)
+        return original(file_path)
+
+    monkeypatch.setattr(service, "_extract_text_uncached", counting)
+
+    assert service.extract_text(path) == "第一版"
+    assert service.extract_text(path) == "第一版"
+    assert len(calls) == 1
+
+    path.write_text("第二版内容", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert service.extract_text(path) == "第二版内容"
+    assert len(calls) == 2
+
+
+def test_join_until_limit_stops_consuming_once_truncated(tmp_path):
+    service = _service(tmp_path)
+    service.text_limit = 12
+    consumed = []
+
+    def pages():
+        for text in ["第一页内容", "", "第二页内容", "第三页内容", "第四页内容"]:
+            consumed.append(text)
+            yield text
+
+    text = service._join_until_limit(pages())
+    assert text == "第一页内容\n\n第二页内容\n\n[文本已截断...]"
+    assert len(consumed) == 4
+
+    service.text_limit = 10000
+    assert service._join_until_limit(iter(["a", None, "b"])) == "a\n\nb"
+
+
+def test_iter_sheet_lines_renders_rows_lazily(tmp_path):
+    service = _service(tmp_path)
+    sheets = [
+        ("销售", [["地区", "金额", None], [None, None, None], ["华东", 12.5, "备注"]]),
+        ("空表", []),
+    ]
+    text = service._join_until_limit(service._iter_sheet_lines(sheets), "\n")
+    assert text == "[销售]\n地区\t金额\n华东\t12.5\t备注\n[空表]"
+
+
+def test_sanitize_filename(tmp_path):
+    service = _service(tmp_path)
+    assert service._sanitize_filename("../../etc/passwd") == "passwd"
+    assert service._sanitize_filename("a\\..\\b\x00.txt") == "a___b_.txt"
+    assert service._sanitize_filename("报告...pdf") == "报告_.pdf"
+    assert service._sanitize_filename("..") == "_"
+    assert service._sanitize_filename("") == "unnamed_file"
+    long_name = service._sanitize_filename("x" * 300 + ".docx")
+    assert len(long_name) == 205 and long_name.endswith(".docx")
+
+
+def test_delete_file_stays_inside_upload_dir(tmp_path):
+    import asyncio
+
+    service = _service(tmp_path)
+    inside = service.upload_dir / "a.txt"
+    inside.write_text("x")
+    sibling = tmp_path / "uploads_old"
+    sibling.mkdir()
+    outside = sibling / "b.txt"
+    outside.write_text("x")
+
+    assert asyncio.run(service.delete_file(str(outside))) is False
+    assert outside.exists()
+    assert asyncio.run(service.delete_file(str(inside))) is True
+    assert not inside.exists()
+    assert asyncio.run(service.delete_file(str(inside))) is False
+
+
+def test_extract_from_text_reads_only_the_needed_prefix(tmp_path):
+    service = _service(tmp_path)
+    service.text_limit = 4
+    path = tmp_path / "big.txt"
+
+    path.write_text("一二三四", encoding="utf-8")
+    assert service._extract_from_text(path) == "一二三四"
+
+    path.write_text("一二三四五" + "x" * 10000, encoding="utf-8")
+    assert service._extract_from_text(path) == "一二三四\n\n[文本已截断...]"
+
+
+def test_save_upload_shares_storage_but_not_paths(tmp_path):
+    import asyncio
+
+    service = _service(tmp_path)
+    first = asyncio.run(service.save_upload("报告.txt", b"same bytes"))
+    second = asyncio.run(service.save_upload("报告.txt", b"same bytes"))
+    other = asyncio.run(service.save_upload("报告.txt", b"other bytes"))
+
+    assert first["id"] != second["id"]
+    assert first["path"] != second["path"]
+    assert os.path.samefile(first["path"], second["path"])
+    assert not os.path.samefile(first["path"], other["path"])
+
+    # Deleting one upload leaves the identical one intact
+    assert asyncio.run(service.delete_file(first["path"])) is True
+    with open(second["path"], "rb") as f:
+        assert f.read() == b"same bytes"
+    assert prune_unreferenced_blobs(service.upload_dir) == 0
+
+    asyncio.run(service.delete_file(second["path"]))
+    assert prune_unreferenced_blobs(service.upload_dir) == 1
+    assert len(os.listdir(service.upload_dir / BLOB_DIR_NAME)) == 1
+
+
+def test_extract_from_xlsx_streams_rows(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "数据"
+    sheet.append(["名称", "数量", None])
+    sheet.append(["苹果", 3, None])
+    workbook.create_sheet("空表")
+    path = tmp_path / "table.xlsx"
+    workbook.save(path)
+
+    assert _service(tmp_path)._extract_from_excel(path) == "[数据]\n名称\t数量\n苹果\t3\n[空表]"
@@ -0,0 +1,14 @@
+# File: backend/tests/unit/test_hashing.py
+# Purpose: Validate fast identity keys.
+from app.core.hashing import FAST_KEY_SIZE, fast_key
+
+
+def test_fast_key_is_stable_and_sized():
+    assert fast_key("system", b"user") == fast_key(b"system", "user")
+    assert len(fast_key("x")) == FAST_KEY_SIZE
+
+
+def test_fast_key_separates_parts():
+    assert fast_key("ab", "c") != fast_key("a", "bc")
+    assert fast_key("abc") != fast_key("ab", "c")
+    assert fast_key("你好") != fast_key("您好")
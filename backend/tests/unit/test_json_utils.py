@@ -0,0 +1,49 @@
+# File: backend/tests/unit/test_json_utils.py
+# Purpose: Validate JSON serialization helper output and fallback behavior.
+import json
+
+import pytest
+
+from app.utils import json_utils
+from app.utils.json_utils import json_dumps, json_dumps_bytes, json_dumps_pretty, json_loads
+
+
+def test_json_dumps_keeps_non_ascii_and_is_compact():
+    assert json_dumps({"path": "~/桌面", "n": [1, 2]}) == '{"path":"~/桌面","n":[1,2]}'
+
+
+def test_json_dumps_handles_values_orjson_rejects():
+    value = {"big": 2**70}
+    assert json.loads(json_dumps(value)) == value
+
+
+def test_json_dumps_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_utils, "orjson", None)
+    assert json_dumps({"名字": "值"}) == '{"名字":"值"}'
+
+
+def test_json_dumps_bytes_applies_default():
+    class Opaque:
+        def __str__(self):
+            return "opaque"
+
+    assert json_dumps_bytes({"r": Opaque()}, default=str) == b'{"r":"opaque"}'
+    assert json.loads(json_dumps_bytes("工具")) == "工具"
+
+
+def test_json_loads_matches_stdlib_and_raises_decode_error(monkeypatch):
+    chunk = '{"choices":[{"delta":{"content":"你好"}}]}'
+    assert json_loads(chunk) == json.loads(chunk)
+    assert json_loads(chunk.encode("utf-8")) == json.loads(chunk)
+    for module in (json_utils.orjson, None):
+        monkeypatch.setattr(json_utils, "orjson", module)
+        with pytest.raises(json.JSONDecodeError):
+            json_loads("{bad")
+
+
+def test_json_dumps_pretty_matches_stdlib_layout(monkeypatch):
+    value = {"q": "天气", "n": [1, {"big": 2**70}]}
+    expected = json.dumps(value, indent=2, ensure_ascii=False)
+    assert json_dumps_pretty(value) == expected
+    monkeypatch.setattr(json_utils, "orjson", None)
+    assert json_dumps_pretty(value) == expected
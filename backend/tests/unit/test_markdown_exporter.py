@@ -0,0 +1,97 @@
+# File: backend/tests/unit/test_markdown_exporter.py
+# Purpose: Validate incremental (append-only) Markdown export against a full export.
+import os
+from datetime import datetime
+
+from app.services.markdown_exporter import FOOTER_PREFIX, MarkdownExporter
+
+
+def _message(index, role="user"):
+    return {
+        "id": f"m{index}",
+        "role": role,
+        "content": f"消息 {index}",
+        "tool_calls": [],
+        "tool_call_results": None,
+        "metadata": None,
+        "created_at": f"2026-01-01T00:00:{index:02d}",
+    }
+
+
+def _strip_footer(text):
+    return text[:text.rindex(FOOTER_PREFIX)]
+
+
+def test_append_matches_full_export(tmp_path):
+    messages = [_message(i, "user" if i % 2 else "assistant") for i in range(1, 7)]
+
+    incremental = MarkdownExporter(str(tmp_path / "incremental"))
+    incremental.export_all("s1", "prompt", messages[:3])
+    state = incremental.read_export_state("s1")
+    assert state["last_message_id"] == "m3"
+    assert state["message_count"] == 3
+    result = incremental.append_messages("s1", "prompt", messages[3:], after_message_id="m3")
+    assert incremental.read_export_state("s1")["last_message_id"] == "m6"
+    assert incremental.read_export_state("s1")["message_count"] == 6
+
+    full = MarkdownExporter(str(tmp_path / "full")).export_all("s1", "prompt", messages)
+    for key in ("simple_chat", "full_chat"):
+        with open(result[key], encoding="utf-8") as f:
+            appended = f.read()
+        with open(full[key], encoding="utf-8") as f:
+            rewritten = f.read()
+        assert _strip_footer(appended) == _strip_footer(rewritten)
+        assert appended.count(FOOTER_PREFIX) == 1
+
+
+def test_append_skips_messages_written_by_overlapping_export(tmp_path):
+    messages = [_message(i) for i in range(1, 5)]
+    exporter = MarkdownExporter(str(tmp_path))
+    exporter.export_all("s1", "prompt", messages[:2])
+    exporter.append_messages("s1", "prompt", messages[2:3], after_message_id="m2")
+
+    # A second export that read the state before the first one appended
+    result = exporter.append_messages("s1", "prompt", messages[2:], after_message_id="m2")
+    with open(result["simple_chat"], encoding="utf-8") as f:
+        text = f.read()
+    assert text.count("消息 3") == 1
+    assert "消息 4" in text
+
+
+def test_append_without_previous_export_returns_none(tmp_path):
+    exporter = MarkdownExporter(str(tmp_path))
+    assert exporter.append_messages("s1", "prompt", [_message(1)], after_message_id="m0") is None
+
+
+def test_append_with_no_new_messages_writes_nothing(tmp_path):
+    exporter = MarkdownExporter(str(tmp_path))
+    paths = exporter.export_all("s1", "prompt", [_message(1)])
+    before = {key: os.stat(path).st_mtime_ns for key, path in paths.items()}
+
+    result = exporter.append_messages("s1", "new prompt", [], after_message_id="m1")
+    assert result == paths
+    assert {key: os.stat(path).st_mtime_ns for key, path in paths.items()} == before
+
+
+def test_message_timestamp_parses_z_suffix_and_falls_back_to_export_time():
+    exporter = MarkdownExporter("unused")
+    now = datetime(2026, 3, 4, 5, 6, 7)
+    assert exporter._message_timestamp({"created_at": "2026-01-02T03:04:05Z"}, now) == "20260102-030405"
+    assert exporter._message_timestamp({"created_at": "not a date"}, now) == "20260304-050607"
+    assert exporter._message_timestamp({}, now) == "20260304-050607"
+
+
+def test_full_export_pretty_prints_tool_payloads(tmp_path):
+    message = _message(1, "assistant")
+    message["tool_calls"] = [
+        {"function": {"name": "search", "arguments": '{"q": "天气"}'}},
+        {"function": {"name": "broken", "arguments": "{not json"}},
+    ]
+    message["tool_call_results"] = [{"ok": True}, "plain text"]
+    path = MarkdownExporter(str(tmp_path)).export_full_chat("s1", [message])
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert '{\n  "q": "天气"\n}' in text
+    assert '{\n  "ok": true\n}' in text
+    assert "{not json" in text
+    assert "plain text" in text
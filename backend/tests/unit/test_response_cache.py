@@ -0,0 +1,32 @@
+# File: backend/tests/unit/test_response_cache.py
+# Purpose: Validate exact-match reply cache keys, LRU eviction and expiry.
+from app.infrastructure.cache.response_cache import ResponseCache
+
+
+def test_key_depends_on_every_input():
+    base = ResponseCache.make_key("u1", "m", "sys", [{"role": "user", "content": "hi"}], "你好")
+    assert base == ResponseCache.make_key("u1", "m", "sys", [{"role": "user", "content": "hi"}], "你好")
+    assert len(base) == 16
+    assert base != ResponseCache.make_key("u2", "m", "sys", [{"role": "user", "content": "hi"}], "你好")
+    assert base != ResponseCache.make_key("u1", "m2", "sys", [{"role": "user", "content": "hi"}], "你好")
+    assert base != ResponseCache.make_key("u1", "m", "sys2", [{"role": "user", "content": "hi"}], "你好")
+    assert base != ResponseCache.make_key("u1", "m", "sys", [], "你好")
+    assert base != ResponseCache.make_key("u1", "m", "sys", [{"role": "user", "content": "hi"}], "您好")
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2, ttl=None)
+    cache.set(b"a", "A")
+    cache.set(b"b", "B")
+    assert cache.get(b"a") == "A"
+    cache.set(b"c", "C")
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == "A"
+    assert cache.get(b"c") == "C"
+
+
+def test_expired_entries_are_dropped():
+    cache = ResponseCache(ttl=0)
+    cache.set(b"a", "A")
+    assert cache.get(b"a") is None
+    assert len(cache) == 0
@@ -0,0 +1,53 @@
+# File: backend/tests/unit/test_retry_policy.py
+# Purpose: Validate decorrelated-jitter delays, Retry-After handling and the wait budget.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure.llm import retry_policy
+from app.infrastructure.llm.retry_policy import RetryPolicy, with_retry
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int, headers: dict):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    policy = RetryPolicy(initial_delay=1.0, max_delay=10.0)
+    prev = None
+    for attempt in range(50):
+        delay = policy.calculate_delay(attempt, prev)
+        assert 1.0 <= delay <= min(10.0, (prev or 1.0) * 3)
+        prev = delay
+
+
+def test_retry_after_parsing():
+    assert RetryPolicy.retry_after(_HTTPError(429, {"retry-after": "7"})) == 7.0
+    assert RetryPolicy.retry_after(_HTTPError(503, {"retry-after": "soon"})) is None
+    assert RetryPolicy.retry_after(ValueError("no response")) is None
+    past = RetryPolicy.retry_after(_HTTPError(503, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+    assert past == 0.0
+
+
+def test_retry_honors_retry_after_and_budget(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(retry_policy.asyncio, "sleep", fake_sleep)
+    calls = []
+
+    @with_retry(max_attempts=4, initial_delay=0.1, max_delay=1.0, max_total_delay=lambda: 6.0)
+    async def flaky():
+        calls.append(1)
+        raise _HTTPError(429, {"retry-after": "4"})
+
+    with pytest.raises(_HTTPError):
+        asyncio.run(flaky())
+    # First wait honors Retry-After; a second 4s wait would exceed the 6s budget
+    assert sleeps == [4.0]
+    assert len(calls) == 2
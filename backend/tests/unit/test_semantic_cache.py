@@ -0,0 +1,36 @@
+# File: backend/tests/unit/test_semantic_cache.py
+# Purpose: Validate semantic cache scoping, similarity threshold and eviction.
+from app.infrastructure.cache.semantic_cache import SemanticCache, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  What IS\n the   Weather? ") == "what is the weather?"
+
+
+def test_hit_requires_same_scope_and_similarity():
+    cache = SemanticCache(threshold=0.95, ttl=None)
+    scope = SemanticCache.make_scope("m", [{"role": "system", "content": "s"}], temperature=0.7)
+    other = SemanticCache.make_scope("m", [{"role": "system", "content": "s2"}], temperature=0.7)
+    cache.store(scope, [1.0, 0.0, 0.0], {"answer": "A"})
+    cache.store(scope, [0.0, 1.0, 0.0], {"answer": "B"})
+
+    response, similarity = cache.lookup(scope, [2.0, 0.1, 0.0])
+    assert response == {"answer": "A"}
+    assert similarity > 0.99
+    assert cache.lookup(scope, [1.0, 1.0, 0.0]) is None  # cos = 0.707
+    assert cache.lookup(other, [1.0, 0.0, 0.0]) is None
+    assert cache.lookup(scope, [0.0, 0.0]) is None
+
+
+def test_entries_per_scope_and_expiry():
+    cache = SemanticCache(entries_per_scope=2, ttl=None)
+    cache.store(b"s", [1.0, 0.0, 0.0], {"n": 1})
+    cache.store(b"s", [0.0, 1.0, 0.0], {"n": 2})
+    cache.store(b"s", [0.0, 0.0, 1.0], {"n": 3})
+    assert len(cache) == 2
+    assert cache.lookup(b"s", [1.0, 0.0, 0.0]) is None
+
+    expired = SemanticCache(ttl=0)
+    expired.store(b"s", [1.0], {"n": 1})
+    assert expired.lookup(b"s", [1.0]) is None
+    assert len(expired) == 0
@@ -0,0 +1,53 @@
+# File: backend/tests/unit/test_sse.py
+# Purpose: Validate SSE frame encoding and frame coalescing.
+import asyncio
+import contextvars
+
+from app.utils.sse import coalesce_frames, sse_event
+
+
+def _collect(frames, **kwargs):
+    async def run():
+        return [chunk async for chunk in coalesce_frames(frames, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_sse_event_encodes_utf8_json():
+    assert sse_event("content", "你好") == 'event: content\ndata: "你好"\n\n'.encode("utf-8")
+
+
+def test_coalesces_burst_into_one_write():
+    async def frames():
+        for i in range(5):
+            yield b"f%d" % i
+
+    assert _collect(frames(), max_bytes=4096, max_delay_s=1.0) == [b"f0f1f2f3f4"]
+
+
+def test_flushes_when_size_limit_reached():
+    async def frames():
+        for _ in range(4):
+            yield b"xxxx"
+
+    assert _collect(frames(), max_bytes=8, max_delay_s=1.0) == [b"xxxxxxxx", b"xxxxxxxx"]
+
+
+def test_flushes_buffer_while_source_is_idle():
+    async def frames():
+        yield b"a"
+        await asyncio.sleep(0.05)
+        yield b"b"
+
+    assert _collect(frames(), max_bytes=4096, max_delay_s=0.005) == [b"a", b"b"]
+
+
+def test_context_variables_persist_across_frames():
+    var = contextvars.ContextVar("var", default="unset")
+
+    async def frames():
+        var.set("set")
+        yield b"1"
+        await asyncio.sleep(0.02)
+        yield var.get().encode()
+
+    assert b"".join(_collect(frames(), max_bytes=4096, max_delay_s=0.005)) == b"1set"
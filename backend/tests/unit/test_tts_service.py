@@ -0,0 +1,33 @@
+# File: backend/tests/unit/test_tts_service.py
+# Purpose: Validate TextSegmenter streaming segmentation behavior.
+from app.services.tts_service import TextSegmenter, segment_text_stream
+
+
+def test_short_text_is_buffered_until_min_length():
+    segmenter = TextSegmenter(min_length=10, max_length=200, prefer_length=50)
+    assert segmenter.add_text("你好。") == []
+    assert segmenter.buffer == "你好。"
+    assert segmenter.flush() == "你好。"
+    assert segmenter.flush() is None
+
+
+def test_splits_on_sentence_ending_across_chunks():
+    segmenter = TextSegmenter(min_length=5, max_length=200, prefer_length=10)
+    segments = []
+    for chunk in ["今天天气", "很好，我们", "去公园吧。然后", "回家"]:
+        segments.extend(segmenter.add_text(chunk))
+    assert segments == ["今天天气很好，我们去公园吧。"]
+    assert segmenter.flush() == "然后回家"
+
+
+def test_force_split_prefers_secondary_delimiter():
+    segmenter = TextSegmenter(min_length=5, max_length=12, prefer_length=8)
+    segments = segmenter.add_text("一二三四五，六七八九十一二三四")
+    assert segments == ["一二三四五，"]
+    assert segmenter.buffer == "六七八九十一二三四"
+
+
+def test_segment_text_stream_keeps_all_text():
+    chunks = ["流式文本语音合成SDK，", "可以将输入的文本", "合成为语音二进制数据。", "适用于实时场景"]
+    segments = list(segment_text_stream(iter(chunks), min_length=10, max_length=200, prefer_length=20))
+    assert "".join(segments) == "".join(chunks)
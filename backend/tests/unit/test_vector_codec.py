@@ -0,0 +1,23 @@
+# File: backend/tests/unit/test_vector_codec.py
+# Purpose: Validate packed float16/float32 vector encoding.
+import pytest
+
+from app.utils.vector_codec import decode_vectors, encode_vectors
+
+
+def test_round_trip_float32_and_float16():
+    vectors = [[0.1, -0.25, 0.5], [1.0, 0.0, -1.0]]
+
+    decoded = decode_vectors(encode_vectors(vectors, "f4"), 3, "f4")
+    assert decoded == [pytest.approx(v, rel=1e-6) for v in vectors]
+
+    encoded = encode_vectors(vectors, "f2")
+    assert len(encoded) < len(encode_vectors(vectors, "f4"))
+    assert decode_vectors(encoded, 3, "f2") == [pytest.approx(v, abs=1e-3) for v in vectors]
+
+
+def test_rejects_partial_vectors_and_overflow():
+    with pytest.raises(ValueError):
+        decode_vectors(encode_vectors([[1.0, 2.0]], "f4"), 3, "f4")
+    with pytest.raises(OverflowError):
+        encode_vectors([[1e6]], "f2")